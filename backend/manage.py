@@ -0,0 +1,110 @@
+"""
+Operational commands for the Solar System Portfolio API.
+
+Run from the backend directory, e.g. `python manage.py migrate-analytics`.
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+import typer
+from pymongo import DeleteOne, ReplaceOne
+
+import server
+from server import BlogSnapshot, analytics_from_document, analytics_to_document, client, db, logger
+
+
+cli = typer.Typer(help="Solar System Portfolio maintenance commands")
+
+
+@cli.callback()
+def main():
+    """Solar System Portfolio maintenance commands."""
+
+
+async def collection_size(name: str) -> dict:
+    stats = await db.command("collStats", name)
+    return {"storage": stats.get("storageSize", 0), "indexes": stats.get("totalIndexSize", 0)}
+
+
+async def migrate_analytics_documents(batch_size: int, pause: float) -> int:
+    """Rewrite legacy analytics documents into the compact schema in batches"""
+    migrated = 0
+    while True:
+        legacy_docs = await db.analytics.find(server.LEGACY_ANALYTICS_FILTER).limit(batch_size).to_list(batch_size)
+        if not legacy_docs:
+            break
+
+        operations = []
+        for legacy in legacy_docs:
+            compact = analytics_to_document(analytics_from_document(legacy))
+            # Upsert first so a crash between the two writes never loses an event
+            operations.append(ReplaceOne({"_id": compact["_id"]}, compact, upsert=True))
+            operations.append(DeleteOne({"_id": legacy["_id"]}))
+
+        await db.analytics.bulk_write(operations, ordered=True)
+        migrated += len(legacy_docs)
+        logger.info(f"Migrated {migrated} analytics documents")
+
+        if pause:
+            await asyncio.sleep(pause)
+
+    await server.prepare_analytics_storage()
+    return migrated
+
+
+@cli.command("migrate-analytics")
+def migrate_analytics(
+    batch_size: int = typer.Option(1000, help="Documents rewritten per bulk write"),
+    pause: float = typer.Option(0.0, help="Seconds to sleep between batches to limit load"),
+):
+    """Convert analytics documents to the compact storage schema."""
+
+    async def run():
+        before = await collection_size("analytics")
+        migrated = await migrate_analytics_documents(batch_size, pause)
+        after = await collection_size("analytics")
+        typer.echo(f"Migrated {migrated} documents")
+        typer.echo(f"Storage: {before['storage']} -> {after['storage']} bytes")
+        typer.echo(f"Indexes: {before['indexes']} -> {after['indexes']} bytes")
+
+    try:
+        asyncio.run(run())
+    finally:
+        client.close()
+
+
+@cli.command("export-snapshot")
+def export_snapshot(
+    out: Path = typer.Option(None, help="Output directory (defaults to SNAPSHOT_DIR)"),
+):
+    """Write the published blog and taxonomy as static, precompressed JSON and delete expired old versions."""
+    root = out or (Path(server.SNAPSHOT_DIR) if server.SNAPSHOT_DIR else None)
+    if root is None:
+        typer.echo("Pass --out or set SNAPSHOT_DIR", err=True)
+        raise typer.Exit(code=1)
+
+    try:
+        exported = asyncio.run(BlogSnapshot(root).rebuild_all())
+    finally:
+        client.close()
+    typer.echo(f"Exported {exported} published posts to {root}")
+
+
+@cli.command("sign-profile")
+def sign_profile(
+    path: str = typer.Argument(..., help="Request path, e.g. /api/analytics/stats"),
+    method: str = typer.Option("GET", help="HTTP method of the request to profile"),
+    ttl: int = typer.Option(300, help="Seconds the signature stays valid"),
+):
+    """Print an X-Profile-Signature header that profiles requests to PATH."""
+    if not server.ADMIN_TOKEN:
+        typer.echo("ADMIN_TOKEN is not configured", err=True)
+        raise typer.Exit(code=1)
+    expires = int(time.time()) + ttl
+    typer.echo(f"X-Profile-Signature: {server.profile_signature(method, path, expires)}")
+
+
+if __name__ == "__main__":
+    cli()
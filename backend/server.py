@@ -1,13 +1,20 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Form, File, UploadFile, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, APIRouter, HTTPException, Form, File, UploadFile, BackgroundTasks, Request, Header, Depends
+from fastapi.responses import FileResponse, StreamingResponse, JSONResponse
+from fastapi.encoders import jsonable_encoder
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from bson.binary import Binary
+from pymongo import CursorType, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, CollectionInvalid, DuplicateKeyError
+from pydantic import ValidationError
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Awaitable, IO, Iterator, Tuple, AsyncIterator
 import uuid
 from datetime import datetime
 from reportlab.lib.pagesizes import letter
@@ -21,6 +28,19 @@ from email.mime.multipart import MIMEMultipart
 import json
 import tempfile
 import asyncio
+import random
+import time
+import heapq
+import itertools
+import re
+import sys
+import hmac
+import hashlib
+import threading
+import gzip
+import fcntl
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
 
 
 ROOT_DIR = Path(__file__).parent
@@ -56,6 +76,16 @@ class StatusCheck(BaseModel):
 class StatusCheckCreate(BaseModel):
     client_name: str
 
+class StatusClientSummary(BaseModel):
+    client_name: str
+    last_seen: datetime
+    count: int
+    seconds_since_last_seen: float
+    expected_interval_seconds: Optional[float] = None
+    rate_per_minute: Optional[float] = None
+    max_gap_seconds: Optional[float] = None
+    gap_detected: bool
+
 class ContactForm(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
@@ -72,6 +102,7 @@ class ContactFormCreate(BaseModel):
 
 class BlogPost(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    slug: Optional[str] = None
     title: str
     content: str
     excerpt: str
@@ -92,6 +123,14 @@ class BlogPostCreate(BaseModel):
     featured_image: Optional[str] = None
     published: bool = True
 
+class BlogPostImport(BlogPostCreate):
+    # Optional so that both hand-written items and `GET /api/blog/export` output import cleanly
+    id: Optional[str] = Field(None, pattern=r"^[A-Za-z0-9-]{1,64}$")
+    slug: Optional[str] = Field(None, pattern=r"^[a-z0-9]+(-[a-z0-9]+)*$")
+    author: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
 class BlogPostUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
@@ -109,6 +148,7 @@ class AnalyticsEvent(BaseModel):
     project_id: Optional[str] = None
     user_agent: Optional[str] = None
     ip_address: Optional[str] = None
+    sample_weight: float = 1.0  # number of real events this stored event stands for
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 class AnalyticsEventCreate(BaseModel):
@@ -142,12 +182,21 @@ async def send_email(to_email: str, subject: str, body: str):
         logger.error(f"Failed to send email: {str(e)}")
         return False
 
-def generate_resume_pdf(portfolio_data: dict) -> str:
-    """Generate a professional resume PDF and return the file path"""
-    temp_dir = tempfile.mkdtemp()
-    pdf_path = os.path.join(temp_dir, "resume.pdf")
+RESUME_SPOOL_MAX_BYTES = 4 * 1024 * 1024
+RESUME_CHUNK_BYTES = 64 * 1024
+
+def generate_resume_pdf(portfolio_data: dict) -> IO[bytes]:
+    """Generate a professional resume PDF into a buffer rewound to the start.
+
+    The buffer lives in memory and only spills to an anonymous temporary file
+    past RESUME_SPOOL_MAX_BYTES; either way it is removed when closed. The
+    caller owns the buffer and must close it.
+    """
+    buffer = tempfile.SpooledTemporaryFile(max_size=RESUME_SPOOL_MAX_BYTES)
     
-    doc = SimpleDocTemplate(pdf_path, pagesize=letter)
+    # invariant output keeps every render byte-identical, so ranged requests
+    # can resume a download started against an earlier render
+    doc = SimpleDocTemplate(buffer, pagesize=letter, invariant=1)
     styles = getSampleStyleSheet()
     story = []
     
@@ -237,7 +286,1253 @@ def generate_resume_pdf(portfolio_data: dict) -> str:
     story.append(Paragraph(education_text, styles['Normal']))
     
     doc.build(story)
-    return pdf_path
+    buffer.seek(0)
+    return buffer
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single 'bytes=' Range header into an inclusive (start, end) pair.
+
+    Returns None when the whole body should be sent: no header, or a
+    multi-range, non-byte or invalid range, which RFC 9110 lets us ignore.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    start_text, _, end_text = range_header[len("bytes="):].strip().partition("-")
+    if not (start_text or end_text) or not all(text.isdigit() for text in (start_text, end_text) if text):
+        return None
+    if start_text:
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+        if end < start and end_text:
+            # Syntactically invalid, so the range is ignored rather than rejected
+            return None
+    else:
+        # Suffix range: the last N bytes
+        suffix_length = int(end_text)
+        start = max(size - suffix_length, 0) if suffix_length else size
+        end = size - 1
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, min(end, size - 1)
+
+def buffer_etag(buffer: IO[bytes]) -> str:
+    """Strong ETag from the SHA-256 of a buffer's contents; leaves the buffer rewound"""
+    digest = hashlib.sha256()
+    buffer.seek(0)
+    for chunk in iter(lambda: buffer.read(RESUME_CHUNK_BYTES), b""):
+        digest.update(chunk)
+    buffer.seek(0)
+    return f'"{digest.hexdigest()}"'
+
+def if_range_matches(if_range: Optional[str], etag: str) -> bool:
+    """Whether a Range request applies to this representation (RFC 9110 13.1.5).
+
+    Only an exact strong ETag match counts. Weak tags and dates never match,
+    since the response carries no Last-Modified, so the full body is sent.
+    """
+    return if_range is None or if_range.strip() == etag
+
+def iter_buffer_range(buffer: IO[bytes], start: int, end: int) -> Iterator[bytes]:
+    buffer.seek(start)
+    remaining = end - start + 1
+    while remaining > 0:
+        chunk = buffer.read(min(RESUME_CHUNK_BYTES, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
+
+# ===============================
+# CACHING
+# ===============================
+
+CACHE_TTL_SECONDS = float(os.environ.get('CACHE_TTL_SECONDS', '300'))
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', '1024'))
+INVALIDATION_COLLECTION = "cache_invalidations"
+INVALIDATION_COLLECTION_BYTES = 1024 * 1024
+WORKER_ID = str(uuid.uuid4())
+
+class ResponseCache:
+    """Per-worker TTL cache keyed by colon-separated names, e.g. 'blog:post:<id>'.
+
+    Holds at most `max_entries` keys, evicting the least recently used.
+    Loaders returning None (e.g. an unknown post id) are not cached, so
+    lookups of arbitrary keys cannot grow the cache. A load that was in
+    flight when an eviction arrived may have read the pre-update value, so
+    its result is returned but not stored.
+    """
+
+    def __init__(self, ttl_seconds: float = CACHE_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generation = 0
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[1]
+            del self._entries[key]
+        generation = self._generation
+        value = await loader()
+        if value is not None and generation == self._generation:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def evict(self, *prefixes: str) -> int:
+        self._generation += 1
+        stale = [key for key in self._entries if key.startswith(prefixes)]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def clear(self):
+        self._generation += 1
+        self._entries.clear()
+
+class CappedFeed:
+    """Broadcast channel between workers over a capped collection.
+
+    Every worker appends messages and tails the whole collection with a
+    tailable cursor. A sentinel document keeps the collection non-empty so
+    the cursor never dies at startup. Resuming by `_id` is unsafe because
+    ObjectIds from different processes are not in insertion order, so a
+    restarted tail replays the collection in natural order from the start
+    and `on_restart` lets the owner discard state that may have missed
+    messages in between.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        size_bytes: int,
+        on_message: Callable[[dict, datetime], None],
+        on_restart: Optional[Callable[[], None]] = None
+    ):
+        self.name = name
+        self.size_bytes = size_bytes
+        self.on_message = on_message
+        self.on_restart = on_restart
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def collection(self):
+        return db[self.name]
+
+    async def publish(self, message: dict):
+        await self.collection.insert_one({**message, "origin": WORKER_ID, "timestamp": datetime.utcnow()})
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _ensure_collection(self):
+        try:
+            await db.create_collection(self.name, capped=True, size=self.size_bytes)
+        except CollectionInvalid:
+            pass
+        if await self.collection.find_one() is None:
+            await self.collection.insert_one({"sentinel": True})
+
+    async def _run(self):
+        restarted = False
+        while True:
+            try:
+                await self._ensure_collection()
+                if restarted and self.on_restart is not None:
+                    self.on_restart()
+                opened_at = datetime.utcnow()
+                cursor = self.collection.find({}, cursor_type=CursorType.TAILABLE_AWAIT)
+                while cursor.alive:
+                    async for message in cursor:
+                        if not message.get("sentinel"):
+                            self.on_message(message, opened_at)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Tail of {self.name} failed: {str(e)}")
+            restarted = True
+            await asyncio.sleep(1)
+
+class InvalidationBus:
+    """Broadcasts cache evictions to every worker through a CappedFeed.
+
+    Writers evict locally and publish a notice; every worker evicts the
+    announced key prefixes. Replaying old notices only evicts again, so the
+    feed can safely start from the beginning of the collection. If the tail
+    restarts, notices may have been missed, so the whole local cache is
+    dropped.
+    """
+
+    def __init__(self, cache: ResponseCache):
+        self.cache = cache
+        self.feed = CappedFeed(INVALIDATION_COLLECTION, INVALIDATION_COLLECTION_BYTES, self._apply, cache.clear)
+
+    async def publish(self, *prefixes: str):
+        self.cache.evict(*prefixes)
+        try:
+            await self.feed.publish({"prefixes": list(prefixes)})
+        except Exception as e:
+            logger.error(f"Cache invalidation publish failed: {str(e)}")
+
+    def _apply(self, notice: dict, opened_at: datetime):
+        if notice.get("origin") != WORKER_ID:
+            self.cache.evict(*notice.get("prefixes", []))
+
+    def start(self):
+        self.feed.start()
+
+    async def stop(self):
+        await self.feed.stop()
+
+response_cache = ResponseCache()
+invalidation_bus = InvalidationBus(response_cache)
+
+# ===============================
+# ANALYTICS STORAGE
+# ===============================
+
+# Analytics documents are stored compactly: the event UUID doubles as a binary
+# `_id`, fields use short keys, nulls and unit weights are omitted and known
+# event types are stored as small integers. Documents written before the
+# compact schema keep their long keys until `manage.py migrate-analytics`
+# rewrites them; until none are left, queries also match the legacy layout.
+ANALYTICS_FIELD_KEYS = {
+    "event_type": "t",
+    "page": "p",
+    "planet": "pl",
+    "project_id": "pr",
+    "user_agent": "ua",
+    "ip_address": "ip",
+    "sample_weight": "w",
+    "timestamp": "ts",
+}
+ANALYTICS_FIELD_NAMES = {key: name for name, key in ANALYTICS_FIELD_KEYS.items()}
+
+# Append-only: codes are persisted, never renumber existing entries
+ANALYTICS_EVENT_CODES = {
+    "page_view": 1,
+    "planet_click": 2,
+    "project_view": 3,
+    "resume_download": 4,
+    "contact_form_submit": 5,
+    "blog_post_created": 6,
+    "blog_post_view": 7,
+    "project_filter": 8,
+}
+ANALYTICS_EVENT_NAMES = {code: name for name, code in ANALYTICS_EVENT_CODES.items()}
+
+def analytics_to_document(event: AnalyticsEvent) -> dict:
+    """Map an AnalyticsEvent to its compact Mongo document"""
+    try:
+        doc = {"_id": Binary.from_uuid(uuid.UUID(event.id))}
+    except ValueError:
+        doc = {"_id": event.id}
+    for name, value in event.dict(exclude={"id"}).items():
+        if value is None or (name == "sample_weight" and value == 1.0):
+            continue
+        if name == "event_type":
+            value = ANALYTICS_EVENT_CODES.get(value, value)
+        doc[ANALYTICS_FIELD_KEYS[name]] = value
+    return doc
+
+def analytics_from_document(doc: dict) -> AnalyticsEvent:
+    """Map a compact or legacy Mongo document back to an AnalyticsEvent"""
+    if "id" in doc:
+        return AnalyticsEvent(**{k: v for k, v in doc.items() if k != "_id"})
+    event_id = doc["_id"]
+    if isinstance(event_id, Binary):
+        event_id = event_id.as_uuid()
+    fields = {ANALYTICS_FIELD_NAMES[k]: v for k, v in doc.items() if k in ANALYTICS_FIELD_NAMES}
+    fields["event_type"] = ANALYTICS_EVENT_NAMES.get(fields["event_type"], fields["event_type"])
+    return AnalyticsEvent(id=str(event_id), **fields)
+
+ANALYTICS_INDEX = [("t", 1), ("ts", -1)]
+# Partial, so it only holds unmigrated documents and is empty once migration is done
+ANALYTICS_LEGACY_INDEX = [("event_type", 1), ("timestamp", -1)]
+LEGACY_ANALYTICS_FILTER = {"event_type": {"$exists": True}}
+
+# Assume legacy documents exist until check_legacy_analytics() finds none
+analytics_has_legacy_documents = True
+
+async def check_legacy_analytics() -> bool:
+    """Refresh whether queries still need to match legacy-layout documents"""
+    global analytics_has_legacy_documents
+    if analytics_has_legacy_documents:
+        legacy = await db.analytics.find_one(LEGACY_ANALYTICS_FILTER, {"_id": 1})
+        analytics_has_legacy_documents = legacy is not None
+    return analytics_has_legacy_documents
+
+async def prepare_analytics_storage():
+    """Create the analytics indexes and detect whether legacy documents remain"""
+    try:
+        await db.analytics.create_index(ANALYTICS_INDEX)
+        await db.analytics.create_index(ANALYTICS_LEGACY_INDEX, partialFilterExpression=LEGACY_ANALYTICS_FILTER)
+        await check_legacy_analytics()
+    except Exception as e:
+        logger.error(f"Analytics index setup failed: {str(e)}")
+
+def analytics_field(name: str) -> dict:
+    """Aggregation expression reading a field from the current document layout(s)"""
+    key = f"${ANALYTICS_FIELD_KEYS[name]}"
+    if not analytics_has_legacy_documents:
+        return key
+    return {"$ifNull": [key, f"${name}"]}
+
+def analytics_type_match(*event_types: str) -> dict:
+    """Query matching the given event types; each branch is served by its own index"""
+    compact = {"t": {"$in": [ANALYTICS_EVENT_CODES.get(t, t) for t in event_types]}}
+    if not analytics_has_legacy_documents:
+        return compact
+    legacy = {"event_type": {"$in": list(event_types)}}
+    return {"$or": [compact, legacy]}
+
+def analytics_event_name(value) -> str:
+    return ANALYTICS_EVENT_NAMES.get(value, value)
+
+# Events predating sampling count as a single event
+ANALYTICS_WEIGHT = {"$ifNull": ["$w", {"$ifNull": ["$sample_weight", 1]}]}
+
+# ===============================
+# LIVE ANALYTICS
+# ===============================
+
+LIVE_TICK_SECONDS = 1.0
+LIVE_QUEUE_SIZE = int(os.environ.get('ANALYTICS_LIVE_QUEUE_SIZE', '30'))
+LIVE_KEEPALIVE_SECONDS = 15.0
+LIVE_COLLECTION = "analytics_live"
+LIVE_COLLECTION_BYTES = 4 * 1024 * 1024
+# Deltas older than this when a worker starts tailing are history, not live traffic
+LIVE_REPLAY_SECONDS = 5.0
+
+class LiveAnalyticsHub:
+    """Aggregates ingested analytics events into per-second deltas and fans
+    them out to every SSE subscriber from a single producer task.
+
+    Each worker only ingests the events it handled, so every tick it
+    publishes its local counts to a shared CappedFeed. Every worker merges
+    the deltas from all workers and fans the merged totals out to its own
+    subscribers. Subscribers therefore see all traffic, and the Mongo cost is
+    one small insert per worker per active tick, whatever the number of
+    open dashboards.
+    """
+
+    def __init__(
+        self,
+        tick_seconds: float = LIVE_TICK_SECONDS,
+        queue_size: int = LIVE_QUEUE_SIZE,
+        on_flush: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+    ):
+        self.tick_seconds = tick_seconds
+        self.queue_size = queue_size
+        self.on_flush = on_flush
+        self.feed = CappedFeed(LIVE_COLLECTION, LIVE_COLLECTION_BYTES, self._merge_message)
+        self._events: Counter = Counter()
+        self._planets: Counter = Counter()
+        self._merged_events: Counter = Counter()
+        self._merged_planets: Counter = Counter()
+        self._subscribers: set = set()
+        self._seq = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, event: AnalyticsEvent):
+        self._events[event.event_type] += 1
+        if event.planet:
+            self._planets[event.planet] += 1
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def start(self):
+        if self._task is None:
+            self.feed.start()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        await self.feed.stop()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _take_local(self) -> Optional[Dict[str, Any]]:
+        if not self._events:
+            return None
+        # Stored as pairs: event types are client-supplied and may not be valid Mongo keys
+        local = {
+            "events": list(self._events.items()),
+            "planets": list(self._planets.items()),
+        }
+        self._events = Counter()
+        self._planets = Counter()
+        return local
+
+    def _merge(self, delta: dict):
+        self._merged_events.update(dict(delta.get("events", [])))
+        self._merged_planets.update(dict(delta.get("planets", [])))
+
+    def _merge_message(self, message: dict, opened_at: datetime):
+        if (opened_at - message["timestamp"]).total_seconds() <= LIVE_REPLAY_SECONDS:
+            self._merge(message)
+
+    def _flush(self) -> Optional[Dict[str, Any]]:
+        if not self._merged_events:
+            return None
+        self._seq += 1
+        delta = {
+            "seq": self._seq,
+            "timestamp": datetime.utcnow().isoformat(),
+            "events": dict(self._merged_events),
+            "planets": dict(self._merged_planets),
+        }
+        self._merged_events = Counter()
+        self._merged_planets = Counter()
+        return delta
+
+    def _publish(self, delta: Dict[str, Any]):
+        for queue in self._subscribers:
+            if queue.full():
+                # Slow consumer: drop its oldest delta, clients detect the gap via `seq`
+                queue.get_nowait()
+            queue.put_nowait(delta)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.tick_seconds)
+            try:
+                local = self._take_local()
+                if local is not None:
+                    try:
+                        await self.feed.publish(local)
+                    except Exception as e:
+                        # Keep this worker's own subscribers fed while Mongo is unreachable
+                        logger.error(f"Live analytics publish failed: {str(e)}")
+                        self._merge(local)
+                    if self.on_flush is not None:
+                        await self.on_flush(local)
+                delta = self._flush()
+                if delta is not None:
+                    self._publish(delta)
+            except Exception as e:
+                logger.error(f"Live analytics tick failed: {str(e)}")
+
+# Stats caches are invalidated at most once per tick rather than per event
+live_analytics = LiveAnalyticsHub(on_flush=lambda delta: invalidation_bus.publish("analytics:"))
+
+def load_sample_rates(raw: Optional[str]) -> Dict[str, float]:
+    """Parse per-event-type sampling rates, e.g. '{"planet_click": 0.1}'"""
+    if not raw:
+        return {}
+    try:
+        rates = {event_type: float(rate) for event_type, rate in json.loads(raw).items()}
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.error(f"Ignoring invalid ANALYTICS_SAMPLE_RATES: {str(e)}")
+        return {}
+    return {event_type: min(max(rate, 0.0), 1.0) for event_type, rate in rates.items()}
+
+ANALYTICS_SAMPLE_RATES = load_sample_rates(os.environ.get('ANALYTICS_SAMPLE_RATES'))
+
+async def record_analytics_event(event: AnalyticsEvent):
+    """Persist an analytics event and feed it to the live aggregator.
+
+    The live stream always sees every event; storage keeps a sample per
+    ANALYTICS_SAMPLE_RATES and records the inverse rate as `sample_weight`.
+    """
+    live_analytics.record(event)
+    rate = ANALYTICS_SAMPLE_RATES.get(event.event_type, 1.0)
+    if rate < 1.0:
+        if rate <= 0.0 or random.random() >= rate:
+            return
+        event.sample_weight = 1.0 / rate
+    await db.analytics.insert_one(analytics_to_document(event))
+
+# ===============================
+# HEARTBEATS
+# ===============================
+
+# Raw status checks expire after this long; per-client state lives in `status_clients`
+STATUS_CHECK_TTL_SECONDS = int(os.environ.get('STATUS_CHECK_TTL_SECONDS', str(7 * 24 * 3600)))
+STATUS_SYNC_SECONDS = 30.0
+STATUS_GAP_FACTOR = 3.0
+STATUS_GAP_MIN_SECONDS = 60.0
+STATUS_INTERVAL_SMOOTHING = 0.2
+
+class HeartbeatMonitor:
+    """In-memory per-client heartbeat aggregate backing GET /api/status/summary.
+
+    Heartbeats are spread across workers, so the interval and gap statistics
+    are computed atomically in the shared `status_clients` documents (see
+    status_client_update) and only copied here. A worker's own heartbeats
+    just advance `last_seen`, so gap detection reacts before the next sync.
+    Reads are O(number of clients).
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, client_name: str, timestamp: datetime):
+        state = self._clients.get(client_name)
+        if state is None:
+            self._clients[client_name] = {
+                "last_seen": timestamp,
+                "count": 1,
+                "interval": None,
+                "max_gap": None,
+                "synced_at": None,
+            }
+            return
+        state["last_seen"] = max(state["last_seen"], timestamp)
+        state["count"] += 1
+
+    def merge(self, doc: dict):
+        """Adopt the shared statistics from a `status_clients` document"""
+        state = self._clients.setdefault(doc["client_name"], {
+            "last_seen": doc["last_seen"],
+            "count": 0,
+            "interval": None,
+            "max_gap": None,
+            "synced_at": None,
+        })
+        if state["synced_at"] is not None and state["synced_at"] > doc["last_seen"]:
+            # Already merged a newer document, e.g. returned by this worker's own upsert
+            return
+        interval = doc.get("interval")
+        if interval is None and doc["count"] > 1:
+            # Written before the shared interval existed: fall back to the mean
+            interval = (doc["last_seen"] - doc["first_seen"]).total_seconds() / (doc["count"] - 1)
+        state["synced_at"] = doc["last_seen"]
+        state["last_seen"] = max(state["last_seen"], doc["last_seen"])
+        state["count"] = max(state["count"], doc["count"])
+        state["interval"] = interval
+        state["max_gap"] = doc.get("max_gap")
+
+    def summary(self, now: Optional[datetime] = None) -> List[StatusClientSummary]:
+        now = now or datetime.utcnow()
+        summaries = []
+        for client_name, state in self._clients.items():
+            since = max((now - state["last_seen"]).total_seconds(), 0.0)
+            interval = state["interval"]
+            threshold = max(STATUS_GAP_FACTOR * interval, STATUS_GAP_MIN_SECONDS) if interval else STATUS_GAP_MIN_SECONDS
+            summaries.append(StatusClientSummary(
+                client_name=client_name,
+                last_seen=state["last_seen"],
+                count=state["count"],
+                seconds_since_last_seen=since,
+                expected_interval_seconds=interval,
+                rate_per_minute=60.0 / interval if interval else None,
+                max_gap_seconds=state["max_gap"],
+                gap_detected=since > threshold
+            ))
+        return summaries
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _ensure_indexes(self):
+        ttl_index = (await db.status_checks.index_information()).get("timestamp_1")
+        if ttl_index is None:
+            await db.status_checks.create_index("timestamp", expireAfterSeconds=STATUS_CHECK_TTL_SECONDS)
+        elif ttl_index.get("expireAfterSeconds") != STATUS_CHECK_TTL_SECONDS:
+            # create_index rejects changed options; collMod updates the TTL in place
+            await db.command(
+                "collMod", "status_checks",
+                index={"keyPattern": {"timestamp": 1}, "expireAfterSeconds": STATUS_CHECK_TTL_SECONDS}
+            )
+        await db.status_clients.create_index("client_name", unique=True)
+
+    async def _run(self):
+        indexes_ready = False
+        while True:
+            if not indexes_ready:
+                try:
+                    await self._ensure_indexes()
+                    indexes_ready = True
+                except Exception as e:
+                    logger.error(f"Heartbeat index setup failed: {str(e)}")
+            try:
+                async for doc in db.status_clients.find():
+                    self.merge(doc)
+            except Exception as e:
+                logger.error(f"Heartbeat sync failed: {str(e)}")
+            await asyncio.sleep(STATUS_SYNC_SECONDS)
+
+def status_client_update(timestamp: datetime) -> List[dict]:
+    """Pipeline folding one heartbeat into a `status_clients` document.
+
+    Every worker's heartbeats land in the same document, so the gap since
+    the previous `last_seen`, the smoothed interval and the largest gap are
+    computed here, in one atomic update. Out-of-order heartbeats only count.
+    """
+    previous = {"$ifNull": ["$last_seen", timestamp]}
+    interval = {"$ifNull": ["$interval", "$_gap"]}
+    return [
+        {"$set": {"_gap": {"$cond": [
+            {"$gt": [timestamp, previous]},
+            {"$divide": [{"$subtract": [timestamp, "$last_seen"]}, 1000]},
+            None
+        ]}}},
+        {"$set": {
+            "interval": {"$cond": [
+                {"$eq": ["$_gap", None]},
+                "$interval",
+                {"$add": [interval, {"$multiply": [STATUS_INTERVAL_SMOOTHING, {"$subtract": ["$_gap", interval]}]}]}
+            ]},
+            "max_gap": {"$max": ["$max_gap", "$_gap"]},
+            "last_seen": {"$max": ["$last_seen", timestamp]},
+            "first_seen": {"$min": ["$first_seen", timestamp]},
+            "count": {"$add": [{"$ifNull": ["$count", 0]}, 1]},
+        }},
+        {"$unset": "_gap"},
+    ]
+
+async def upsert_status_client(status_obj: StatusCheck) -> dict:
+    """Fold a heartbeat into the client's latest-state document and return it"""
+    update = status_client_update(status_obj.timestamp)
+    try:
+        return await db.status_clients.find_one_and_update(
+            {"client_name": status_obj.client_name}, update, upsert=True, return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # A concurrent first heartbeat inserted the document; it now exists, so update it
+        return await db.status_clients.find_one_and_update(
+            {"client_name": status_obj.client_name}, update, upsert=True, return_document=ReturnDocument.AFTER
+        )
+
+heartbeat_monitor = HeartbeatMonitor()
+
+# ===============================
+# BLOG IMPORT/EXPORT
+# ===============================
+
+BLOG_IMPORT_BATCH_SIZE = 1000
+# Posts created before slugs existed have none, so uniqueness only covers posts that do
+BLOG_SLUG_INDEX_FILTER = {"slug": {"$type": "string"}}
+
+def blog_post_slug(title: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+    return slug or f"post-{hashlib.sha256(title.encode()).hexdigest()[:12]}"
+
+async def prepare_blog_storage():
+    """Create the unique blog indexes and give pre-existing posts a slug"""
+    try:
+        await db.blog_posts.create_index("id", unique=True)
+    except Exception as e:
+        logger.error(f"Blog id index setup failed: {str(e)}")
+    try:
+        await db.blog_posts.create_index("slug", unique=True, partialFilterExpression=BLOG_SLUG_INDEX_FILTER)
+        async for post in db.blog_posts.find({"slug": {"$exists": False}}, {"id": 1, "title": 1}):
+            try:
+                await db.blog_posts.update_one({"id": post["id"]}, {"$set": {"slug": blog_post_slug(post["title"])}})
+            except DuplicateKeyError:
+                await db.blog_posts.update_one(
+                    {"id": post["id"]},
+                    {"$set": {"slug": f"{blog_post_slug(post['title'])}-{post['id'][:8]}"}}
+                )
+    except Exception as e:
+        logger.error(f"Blog slug setup failed: {str(e)}")
+
+def blog_import_operation(item: BlogPostImport) -> UpdateOne:
+    """Upsert for one imported post, keyed by its id or, failing that, its slug"""
+    now = datetime.utcnow()
+    slug = item.slug or blog_post_slug(item.title)
+    fields = item.dict(exclude={"id", "slug", "author", "created_at", "updated_at"})
+    fields["updated_at"] = item.updated_at or now
+    on_insert = {"created_at": item.created_at or now}
+    if item.id:
+        key = {"id": item.id}
+        on_insert["slug"] = slug
+    else:
+        key = {"slug": slug}
+        on_insert["id"] = str(uuid.uuid4())
+    if item.author:
+        fields["author"] = item.author
+    else:
+        on_insert["author"] = BlogPost.model_fields["author"].default
+    return UpdateOne(key, {"$set": fields, "$setOnInsert": on_insert}, upsert=True)
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Yield (line number, line) for each non-blank line of a streamed NDJSON body"""
+    pending = b""
+    line_number = 0
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if pending.strip():
+        yield line_number + 1, pending
+
+async def apply_blog_import_batch(operations: List[UpdateOne], line_numbers: List[int], report: Dict[str, Any]):
+    try:
+        result = (await db.blog_posts.bulk_write(operations, ordered=False)).bulk_api_result
+    except BulkWriteError as e:
+        result = e.details
+        for error in result.get("writeErrors", []):
+            report["errors"].append({"line": line_numbers[error["index"]], "error": error.get("errmsg", "write failed")})
+    report["upserted"] += result.get("nUpserted", 0)
+    report["updated"] += result.get("nMatched", 0)
+
+# ===============================
+# STATIC SNAPSHOTS
+# ===============================
+
+# When set, blog writes keep a static snapshot of the published blog in this
+# directory for a CDN or nginx to serve; `manage.py export-snapshot` builds it from scratch
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR')
+SNAPSHOT_INDEX_LIMIT = 20
+# Superseded versions stay servable this long for clients holding an older manifest
+SNAPSHOT_RETAIN_SECONDS = float(os.environ.get('SNAPSHOT_RETAIN_SECONDS', str(24 * 3600)))
+
+class BlogSnapshot:
+    """Precompressed, content-hashed JSON snapshot of the published blog.
+
+    Logical files (`posts/<id>`, `categories/<category>`, `index`,
+    `categories`, `tags`) are written as `<name>.<hash>.json` plus a `.gz`
+    sibling, and `manifest.json` maps each logical name to its current file.
+    Unchanged content keeps its filename, so only the files affected by a
+    write are replaced. Replaced versions are listed as `retired` and kept
+    for SNAPSHOT_RETAIN_SECONDS; files of deleted or unpublished posts go
+    at once. File names are derived from hashes and slugs, never from raw
+    ids, and every path is checked to stay inside the root.
+
+    Every worker runs the post-write hook against the same directory, so
+    each read-modify-write of the manifest holds an flock on `.lock`.
+    """
+
+    def __init__(self, root: Path, retain_seconds: float = SNAPSHOT_RETAIN_SECONDS):
+        self.root = root
+        self.retain_seconds = retain_seconds
+        self._lock = asyncio.Lock()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / "manifest.json"
+
+    @asynccontextmanager
+    async def _exclusive(self):
+        async with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.root / ".lock", "a") as lock_file:
+                await run_in_threadpool(fcntl.flock, lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if not self.manifest_path.exists():
+            return {"files": {}, "retired": []}
+        saved = json.loads(self.manifest_path.read_text())
+        return {"files": saved.get("files", {}), "retired": saved.get("retired", [])}
+
+    def _resolve(self, relative_path: str) -> Path:
+        root = self.root.resolve()
+        path = (root / relative_path).resolve()
+        if not path.is_relative_to(root):
+            raise ValueError(f"Snapshot path escapes {root}: {relative_path}")
+        return path
+
+    @staticmethod
+    def _post_stem(post_id: str) -> str:
+        return f"posts/{hashlib.sha256(post_id.encode()).hexdigest()[:16]}"
+
+    def _write_atomic(self, path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def _unlink(self, relative_path: str):
+        self._resolve(relative_path).unlink(missing_ok=True)
+        self._resolve(f"{relative_path}.gz").unlink(missing_ok=True)
+
+    def _remove(self, manifest: dict, name: str):
+        entry = manifest["files"].pop(name, None)
+        if entry is not None:
+            self._unlink(entry["path"])
+        retired = [item for item in manifest["retired"] if item["name"] == name]
+        for item in retired:
+            self._unlink(item["path"])
+        manifest["retired"] = [item for item in manifest["retired"] if item["name"] != name]
+
+    def _prune_retired(self, manifest: dict):
+        cutoff = time.time() - self.retain_seconds
+        for item in manifest["retired"]:
+            if item["retired_at"] < cutoff:
+                self._unlink(item["path"])
+        manifest["retired"] = [item for item in manifest["retired"] if item["retired_at"] >= cutoff]
+
+    def _write(self, manifest: dict, name: str, file_stem: str, payload: Any, **meta):
+        body = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":")).encode()
+        digest = hashlib.sha256(body).hexdigest()[:16]
+        entry = manifest["files"].get(name)
+        if entry is not None and entry["sha256"] == digest:
+            return
+        relative_path = f"{file_stem}.{digest}.json"
+        self._write_atomic(self._resolve(relative_path), body)
+        self._write_atomic(self._resolve(f"{relative_path}.gz"), gzip.compress(body, compresslevel=9, mtime=0))
+        if entry is not None:
+            manifest["retired"].append({"name": name, "path": entry["path"], "retired_at": time.time()})
+        manifest["files"][name] = {"path": relative_path, "sha256": digest, "size": len(body), **meta}
+
+    def _save_manifest(self, manifest: dict):
+        self._prune_retired(manifest)
+        body = json.dumps({"generated_at": datetime.utcnow().isoformat(), **manifest}, sort_keys=True, indent=2)
+        self._write_atomic(self.manifest_path, body.encode())
+
+    def _collect_orphans(self, manifest: dict):
+        """Delete files the manifest no longer references, e.g. left by a crash, once past retention"""
+        referenced = {self.manifest_path.resolve()}
+        for item in [*manifest["files"].values(), *manifest["retired"]]:
+            path = self._resolve(item["path"])
+            referenced.update((path, path.with_name(f"{path.name}.gz")))
+        cutoff = time.time() - self.retain_seconds
+        for path in self.root.resolve().rglob("*.json*"):
+            try:
+                if path not in referenced and path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+
+    async def _published_posts(self, query: dict, limit: Optional[int] = None) -> List[BlogPost]:
+        cursor = db.blog_posts.find({**query, "published": True}).sort("created_at", -1)
+        if limit:
+            cursor = cursor.limit(limit)
+        return [BlogPost(**post) async for post in cursor]
+
+    async def _taxonomy(self) -> Tuple[dict, dict]:
+        categories = await db.blog_posts.distinct("category", {"published": True})
+        pipeline = [
+            {"$match": {"published": True}},
+            {"$unwind": "$tags"},
+            {"$group": {"_id": "$tags", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}}
+        ]
+        tags = await db.blog_posts.aggregate(pipeline).to_list(100)
+        return {"categories": categories}, {"tags": [{"tag": tag["_id"], "count": tag["count"]} for tag in tags]}
+
+    async def _write_category(self, manifest: dict, category: str):
+        posts = await self._published_posts({"category": category})
+        name = f"categories/{category}"
+        if posts:
+            await run_in_threadpool(self._write, manifest, name, f"categories/{blog_post_slug(category)}", posts)
+        else:
+            await run_in_threadpool(self._remove, manifest, name)
+
+    async def _write_listings(self, manifest: dict):
+        index = await self._published_posts({}, SNAPSHOT_INDEX_LIMIT)
+        categories, tags = await self._taxonomy()
+        await run_in_threadpool(self._write, manifest, "index", "index", index)
+        await run_in_threadpool(self._write, manifest, "categories", "categories", categories)
+        await run_in_threadpool(self._write, manifest, "tags", "tags", tags)
+
+    async def rebuild_posts(self, post_ids: List[str]):
+        """Refresh the files affected by writes to the given posts"""
+        async with self._exclusive():
+            manifest = await run_in_threadpool(self._load_manifest)
+            categories = set()
+            for post_id in post_ids:
+                name = f"posts/{post_id}"
+                if name in manifest["files"]:
+                    categories.add(manifest["files"][name]["category"])
+                post = await db.blog_posts.find_one({"id": post_id, "published": True})
+                if post:
+                    post_obj = BlogPost(**post)
+                    categories.add(post_obj.category)
+                    await run_in_threadpool(
+                        self._write, manifest, name, self._post_stem(post_id), post_obj, category=post_obj.category
+                    )
+                else:
+                    await run_in_threadpool(self._remove, manifest, name)
+            for category in categories:
+                await self._write_category(manifest, category)
+            await self._write_listings(manifest)
+            await run_in_threadpool(self._save_manifest, manifest)
+
+    async def rebuild_all(self) -> int:
+        """Rebuild every file, drop ones no longer backed by a published post and collect orphans"""
+        async with self._exclusive():
+            manifest = await run_in_threadpool(self._load_manifest)
+            stale = set(manifest["files"])
+            posts = await self._published_posts({})
+            for post in posts:
+                name = f"posts/{post.id}"
+                await run_in_threadpool(
+                    self._write, manifest, name, self._post_stem(post.id), post, category=post.category
+                )
+                stale.discard(name)
+            for category in {post.category for post in posts}:
+                await self._write_category(manifest, category)
+                stale.discard(f"categories/{category}")
+            await self._write_listings(manifest)
+            stale -= {"index", "categories", "tags"}
+            for name in stale:
+                await run_in_threadpool(self._remove, manifest, name)
+            await run_in_threadpool(self._save_manifest, manifest)
+            await run_in_threadpool(self._collect_orphans, manifest)
+            return len(posts)
+
+blog_snapshot = BlogSnapshot(Path(SNAPSHOT_DIR)) if SNAPSHOT_DIR else None
+
+async def refresh_blog_snapshot(post_ids: Optional[List[str]] = None):
+    """Post-write hook: rebuild the affected snapshot files, or everything if post_ids is None"""
+    if blog_snapshot is None:
+        return
+    try:
+        if post_ids is None:
+            await blog_snapshot.rebuild_all()
+        else:
+            await blog_snapshot.rebuild_posts(post_ids)
+    except Exception as e:
+        logger.error(f"Blog snapshot refresh failed: {str(e)}")
+
+# ===============================
+# ADMISSION CONTROL
+# ===============================
+
+READ_METHODS = ("GET", "HEAD")
+ADMISSION_RETRY_AFTER_SECONDS = int(os.environ.get('ADMISSION_RETRY_AFTER_SECONDS', '2'))
+
+class PriorityLimiter:
+    """Concurrency limit with a bounded wait queue served lowest priority value first"""
+
+    def __init__(self, limit: int, max_waiting: int, timeout_seconds: float):
+        self.limit = limit
+        self.max_waiting = max_waiting
+        self.timeout_seconds = timeout_seconds
+        self._active = 0
+        self._waiters: list = []
+        self._order = itertools.count()
+
+    async def acquire(self, priority: int) -> bool:
+        """Take a slot, waiting if needed; False means the request should be shed"""
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            return True
+        if len(self._waiters) >= self.max_waiting:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._order), waiter)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await asyncio.wait_for(waiter, self.timeout_seconds)
+            return True
+        except asyncio.TimeoutError:
+            self._abandon(entry)
+            return False
+        except asyncio.CancelledError:
+            self._abandon(entry)
+            raise
+
+    def _abandon(self, entry: tuple):
+        waiter = entry[2]
+        if waiter.done() and not waiter.cancelled():
+            # The slot was handed over as we gave up; pass it on
+            self.release()
+        elif entry in self._waiters:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+
+    def release(self):
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+ADMISSION_LIMITERS = {
+    "expensive": PriorityLimiter(
+        limit=int(os.environ.get('ADMISSION_EXPENSIVE_CONCURRENCY', '4')),
+        max_waiting=int(os.environ.get('ADMISSION_EXPENSIVE_QUEUE', '16')),
+        timeout_seconds=5.0
+    ),
+    "cheap": PriorityLimiter(
+        limit=int(os.environ.get('ADMISSION_CHEAP_CONCURRENCY', '64')),
+        max_waiting=int(os.environ.get('ADMISSION_CHEAP_QUEUE', '256')),
+        timeout_seconds=2.0
+    ),
+}
+
+def classify_request(method: str, path: str) -> Optional[str]:
+    """Map a request to its admission class, or None to admit it unconditionally"""
+    if path in ("/api/resume/download", "/api/analytics/stats"):
+        return "expensive"
+    if path.startswith("/api/blog") and method in READ_METHODS:
+        return "cheap"
+    if path == "/api/analytics/event":
+        return "cheap"
+    # Everything else, including the long-lived /api/analytics/live stream
+    return None
+
+class AdmissionControlMiddleware:
+    """Sheds excess load with fast 503s instead of queueing on the event loop and Mongo pool"""
+
+    def __init__(self, app, limiters: Optional[Dict[str, PriorityLimiter]] = None):
+        self.app = app
+        self.limiters = limiters if limiters is not None else ADMISSION_LIMITERS
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify_request(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[route_class]
+        priority = 0 if scope["method"] in READ_METHODS else 1
+        if not await limiter.acquire(priority):
+            logger.warning(f"Shedding {scope['method']} {scope['path']} ({route_class} limit reached)")
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry"},
+                status_code=503,
+                headers={"Retry-After": str(ADMISSION_RETRY_AFTER_SECONDS)}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+# ===============================
+# PROFILING
+# ===============================
+
+# Shared secret for the admin endpoints and for signing profiling requests
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+PROFILE_DIR = Path(os.environ.get('PROFILE_DIR', str(ROOT_DIR / 'profiles')))
+PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', '50'))
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_INTERVAL_SECONDS = 0.005
+# A capture stops sampling at whichever limit comes first
+PROFILE_MAX_SECONDS = 30.0
+PROFILE_MAX_SAMPLES = 20000
+# Long-lived streams would keep a sampler running for the whole connection
+PROFILE_EXCLUDED_PATHS = ("/api/analytics/live",)
+PROFILE_HEADER = b"x-profile-signature"
+PROFILE_NAME_PATTERN = re.compile(r"^[\w.-]+\.txt$")
+# Leaf frames in these files mean a non-loop thread is parked waiting for work
+IDLE_THREAD_FILES = ("threading.py", "queue.py", os.path.join("concurrent", "futures", "thread.py"))
+
+def profile_signature(method: str, path: str, expires: int) -> str:
+    """Value for the X-Profile-Signature header authorising one route until `expires`"""
+    message = f"{method.upper()} {path} {expires}".encode()
+    digest = hmac.new(ADMIN_TOKEN.encode(), message, hashlib.sha256).hexdigest()
+    return f"{expires}.{digest}"
+
+def profile_requested(scope) -> bool:
+    if scope["path"] in PROFILE_EXCLUDED_PATHS:
+        return False
+    if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+        return True
+    if not ADMIN_TOKEN:
+        return False
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            expires, _, _ = value.decode("latin-1").partition(".")
+            if not expires.isdigit() or int(expires) < time.time():
+                return False
+            expected = profile_signature(scope["method"], scope["path"], int(expires))
+            return hmac.compare_digest(value.decode("latin-1"), expected)
+    return False
+
+class StackSampler:
+    """Samples the Python stack of every thread on a background thread.
+
+    Sampling all threads (rather than cProfile on the event loop thread)
+    captures work pushed to the threadpool, such as ReportLab rendering and
+    Motor's pymongo I/O. Samples are classified so a profile shows time
+    the event loop spent waiting (awaiting Motor or the network) apart from
+    time it spent running Python (e.g. Pydantic validation).
+    """
+
+    def __init__(
+        self,
+        loop_thread_id: int,
+        interval_seconds: float = PROFILE_INTERVAL_SECONDS,
+        max_seconds: float = PROFILE_MAX_SECONDS,
+        max_samples: int = PROFILE_MAX_SAMPLES
+    ):
+        self.loop_thread_id = loop_thread_id
+        self.interval_seconds = interval_seconds
+        self.max_seconds = max_seconds
+        self.max_samples = max_samples
+        self.stacks: Counter = Counter()
+        self.categories: Counter = Counter()
+        self.truncated = False
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        names = {}
+        deadline = time.monotonic() + self.max_seconds
+        samples = 0
+        while not self._stopped.wait(self.interval_seconds):
+            if time.monotonic() > deadline or samples >= self.max_samples:
+                self.truncated = True
+                return
+            samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self._thread.ident:
+                    continue
+                category = self._classify(thread_id, frame)
+                if category is None:
+                    continue
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                self.categories[category] += 1
+                self.stacks[f"{names.get(thread_id, thread_id)};{self._collapse(frame)}"] += 1
+
+    def _classify(self, thread_id: int, frame) -> Optional[str]:
+        filename = frame.f_code.co_filename
+        if thread_id == self.loop_thread_id:
+            return "loop_waiting" if filename.endswith("selectors.py") else "loop_running"
+        if filename.endswith(IDLE_THREAD_FILES):
+            return None
+        while frame is not None:
+            if f"{os.sep}pymongo{os.sep}" in frame.f_code.co_filename:
+                return "threads_mongo"
+            frame = frame.f_back
+        return "threads_other"
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+def write_profile(profile_id: str, scope, status: Optional[int], wall_seconds: float,
+                  loop_cpu_seconds: float, sampler: StackSampler) -> Path:
+    """Write a collapsed-stack profile (flamegraph/speedscope compatible) and prune old ones"""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    path_slug = re.sub(r"[^\w]+", "_", scope["path"]).strip("_") or "root"
+    profile_path = PROFILE_DIR / f"{datetime.utcnow():%Y%m%dT%H%M%S}-{scope['method']}-{path_slug}-{profile_id}.txt"
+    header = [
+        f"# {scope['method']} {scope['path']} -> {status}",
+        f"# wall_seconds={wall_seconds:.4f} loop_cpu_seconds={loop_cpu_seconds:.4f}",
+        f"# interval_seconds={sampler.interval_seconds} " + " ".join(
+            f"{category}={count}" for category, count in sorted(sampler.categories.items())
+        ),
+        "# loop_cpu_seconds and samples include any requests running concurrently",
+    ]
+    if sampler.truncated:
+        header.append(f"# sampling stopped early (limit {sampler.max_seconds}s / {sampler.max_samples} samples)")
+    lines = [f"{stack} {count}" for stack, count in sampler.stacks.most_common()]
+    profile_path.write_text("\n".join(header + lines) + "\n")
+
+    profiles = sorted(stat_profiles(), key=lambda item: item[1].st_mtime, reverse=True)
+    for stale, _ in profiles[PROFILE_MAX_FILES:]:
+        stale.unlink(missing_ok=True)
+    return profile_path
+
+def stat_profiles() -> List[Tuple[Path, os.stat_result]]:
+    """Stat each captured profile once, skipping files pruned concurrently"""
+    profiles = []
+    for profile in PROFILE_DIR.glob("*.txt"):
+        try:
+            profiles.append((profile, profile.stat()))
+        except FileNotFoundError:
+            continue
+    return profiles
+
+class ProfilingMiddleware:
+    """Profiles requests carrying a valid X-Profile-Signature, or a random PROFILE_SAMPLE_RATE share.
+
+    Untriggered requests pay only for the trigger check.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+        status = None
+
+        async def send_with_profile_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        sampler = StackSampler(threading.get_ident())
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            wall_seconds = time.perf_counter() - wall_start
+            loop_cpu_seconds = time.thread_time() - cpu_start
+            try:
+                await run_in_threadpool(
+                    write_profile, profile_id, scope, status, wall_seconds, loop_cpu_seconds, sampler
+                )
+            except Exception as e:
+                logger.error(f"Failed to write profile {profile_id}: {str(e)}")
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN or not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin access required")
 
 # ===============================
 # API ENDPOINTS
@@ -252,38 +1547,76 @@ async def root():
 async def create_status_check(input: StatusCheckCreate):
     status_dict = input.dict()
     status_obj = StatusCheck(**status_dict)
-    _ = await db.status_checks.insert_one(status_obj.dict())
+    heartbeat_monitor.record(status_obj.client_name, status_obj.timestamp)
+    _, client_state = await asyncio.gather(
+        db.status_checks.insert_one(status_obj.dict()),
+        upsert_status_client(status_obj)
+    )
+    heartbeat_monitor.merge(client_state)
     return status_obj
 
 @api_router.get("/status", response_model=List[StatusCheck])
 async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
+    status_checks = await db.status_checks.find().sort("timestamp", -1).to_list(1000)
     return [StatusCheck(**status_check) for status_check in status_checks]
 
+@api_router.get("/status/summary", response_model=List[StatusClientSummary])
+async def get_status_summary():
+    """Per-client heartbeat summary with last-seen time, rate and gap detection"""
+    return heartbeat_monitor.summary()
+
 # Resume Download Endpoint
 @api_router.get("/resume/download")
-async def download_resume():
-    """Generate and download a professional resume PDF"""
+async def download_resume(request: Request):
+    """Generate and download a professional resume PDF, honouring Range requests"""
+    buffer = None
     try:
         # Placeholder portfolio data - in production, this would come from database
         portfolio_data = {}
-        pdf_path = generate_resume_pdf(portfolio_data)
+        buffer = await run_in_threadpool(generate_resume_pdf, portfolio_data)
+        size = buffer.seek(0, os.SEEK_END)
+        etag = await run_in_threadpool(buffer_etag, buffer)
         
-        # Track analytics
-        analytics_event = AnalyticsEvent(
-            event_type="resume_download",
-            page="resume"
-        )
-        await db.analytics.insert_one(analytics_event.dict())
+        # A stale If-Range means the client holds bytes from another render: restart with a 200
+        byte_range = None
+        if if_range_matches(request.headers.get("if-range"), etag):
+            byte_range = parse_byte_range(request.headers.get("range"), size)
+        start, end = byte_range if byte_range else (0, size - 1)
+        
+        # Track analytics once per download, not once per resumed chunk
+        if start == 0:
+            analytics_event = AnalyticsEvent(
+                event_type="resume_download",
+                page="resume"
+            )
+            await record_analytics_event(analytics_event)
+        
+        headers = {
+            "Accept-Ranges": "bytes",
+            "ETag": etag,
+            "Content-Length": str(end - start + 1),
+            "Content-Disposition": 'attachment; filename="Alex_Cosmos_Resume.pdf"'
+        }
+        if byte_range:
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
         
-        return FileResponse(
-            pdf_path,
+        response = StreamingResponse(
+            iter_buffer_range(buffer, start, end),
+            status_code=206 if byte_range else 200,
             media_type="application/pdf",
-            filename="Alex_Cosmos_Resume.pdf"
+            headers=headers,
+            background=BackgroundTask(buffer.close)
         )
+        buffer = None
+        return response
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Resume download failed: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to generate resume")
+    finally:
+        if buffer is not None:
+            buffer.close()
 
 # Contact Form Endpoints
 @api_router.post("/contact", response_model=ContactForm)
@@ -309,7 +1642,7 @@ async def submit_contact_form(form_data: ContactFormCreate, background_tasks: Ba
             event_type="contact_form_submit",
             page="contact"
         )
-        await db.analytics.insert_one(analytics_event.dict())
+        await record_analytics_event(analytics_event)
         
         return contact_obj
     except Exception as e:
@@ -324,20 +1657,27 @@ async def get_contact_forms():
 
 # Blog Endpoints
 @api_router.post("/blog", response_model=BlogPost)
-async def create_blog_post(post_data: BlogPostCreate):
+async def create_blog_post(post_data: BlogPostCreate, background_tasks: BackgroundTasks):
     """Create a new blog post"""
     try:
         post_dict = post_data.dict()
-        post_obj = BlogPost(**post_dict)
+        post_obj = BlogPost(**post_dict, slug=blog_post_slug(post_data.title))
         
-        await db.blog_posts.insert_one(post_obj.dict())
+        try:
+            await db.blog_posts.insert_one(post_obj.dict())
+        except DuplicateKeyError:
+            # Another post already has this title's slug
+            post_obj.slug = f"{post_obj.slug}-{post_obj.id[:8]}"
+            await db.blog_posts.insert_one(post_obj.dict())
+        await invalidation_bus.publish("blog:")
+        background_tasks.add_task(refresh_blog_snapshot, [post_obj.id])
         
         # Track analytics
         analytics_event = AnalyticsEvent(
             event_type="blog_post_created",
             page="blog"
         )
-        await db.analytics.insert_one(analytics_event.dict())
+        await record_analytics_event(analytics_event)
         
         return post_obj
     except Exception as e:
@@ -357,13 +1697,85 @@ async def get_blog_posts(
     if published is not None:
         query["published"] = published
     
-    posts = await db.blog_posts.find(query).sort("created_at", -1).limit(limit).to_list(limit)
-    return [BlogPost(**post) for post in posts]
+    async def load_posts():
+        posts = await db.blog_posts.find(query).sort("created_at", -1).limit(limit).to_list(limit)
+        return [BlogPost(**post) for post in posts]
+    
+    return await response_cache.get_or_load(f"blog:list:{category}:{published}:{limit}", load_posts)
+
+# Blog Categories Endpoint
+@api_router.get("/blog/categories")
+async def get_blog_categories():
+    """Get all blog categories"""
+    async def load_categories():
+        categories = await db.blog_posts.distinct("category")
+        return {"categories": categories}
+    
+    return await response_cache.get_or_load("blog:categories", load_categories)
+
+# Blog Tags Endpoint
+@api_router.get("/blog/tags")
+async def get_blog_tags():
+    """Get all blog tags"""
+    async def load_tags():
+        pipeline = [
+            {"$unwind": "$tags"},
+            {"$group": {"_id": "$tags", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}}
+        ]
+        tags = await db.blog_posts.aggregate(pipeline).to_list(100)
+        return {"tags": [{"tag": tag["_id"], "count": tag["count"]} for tag in tags]}
+    
+    return await response_cache.get_or_load("blog:tags", load_tags)
+
+@api_router.post("/blog/bulk")
+async def import_blog_posts(request: Request, background_tasks: BackgroundTasks):
+    """Upsert blog posts streamed as NDJSON, one BlogPostCreate-shaped item per line"""
+    report = {"received": 0, "upserted": 0, "updated": 0, "errors": []}
+    operations, line_numbers = [], []
+    
+    async for line_number, line in iter_ndjson_lines(request.stream()):
+        report["received"] += 1
+        try:
+            item = BlogPostImport.model_validate_json(line)
+        except ValidationError as e:
+            report["errors"].append({"line": line_number, "error": str(e)})
+            continue
+        operations.append(blog_import_operation(item))
+        line_numbers.append(line_number)
+        if len(operations) >= BLOG_IMPORT_BATCH_SIZE:
+            await apply_blog_import_batch(operations, line_numbers, report)
+            operations, line_numbers = [], []
+    
+    if operations:
+        await apply_blog_import_batch(operations, line_numbers, report)
+    if report["upserted"] or report["updated"]:
+        await invalidation_bus.publish("blog:")
+        background_tasks.add_task(refresh_blog_snapshot)
+    return report
+
+@api_router.get("/blog/export")
+async def export_blog_posts(published: Optional[bool] = None):
+    """Stream blog posts as NDJSON, in a format `POST /api/blog/bulk` accepts"""
+    query = {} if published is None else {"published": published}
+    
+    async def post_lines():
+        async for post in db.blog_posts.find(query).sort("created_at", 1):
+            yield BlogPost(**post).json() + "\n"
+    
+    return StreamingResponse(
+        post_lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="blog_posts.ndjson"'}
+    )
 
 @api_router.get("/blog/{post_id}", response_model=BlogPost)
 async def get_blog_post(post_id: str):
     """Get a specific blog post by ID"""
-    post = await db.blog_posts.find_one({"id": post_id})
+    post = await response_cache.get_or_load(
+        f"blog:post:{post_id}",
+        lambda: db.blog_posts.find_one({"id": post_id})
+    )
     if not post:
         raise HTTPException(status_code=404, detail="Blog post not found")
     
@@ -373,31 +1785,36 @@ async def get_blog_post(post_id: str):
         page="blog",
         project_id=post_id
     )
-    await db.analytics.insert_one(analytics_event.dict())
+    await record_analytics_event(analytics_event)
     
     return BlogPost(**post)
 
 @api_router.put("/blog/{post_id}", response_model=BlogPost)
-async def update_blog_post(post_id: str, post_data: BlogPostUpdate):
+async def update_blog_post(post_id: str, post_data: BlogPostUpdate, background_tasks: BackgroundTasks):
     """Update a blog post"""
-    post = await db.blog_posts.find_one({"id": post_id})
-    if not post:
-        raise HTTPException(status_code=404, detail="Blog post not found")
-    
     update_data = {k: v for k, v in post_data.dict().items() if v is not None}
     update_data["updated_at"] = datetime.utcnow()
     
-    await db.blog_posts.update_one({"id": post_id}, {"$set": update_data})
+    updated_post = await db.blog_posts.find_one_and_update(
+        {"id": post_id},
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER
+    )
+    if not updated_post:
+        raise HTTPException(status_code=404, detail="Blog post not found")
+    await invalidation_bus.publish("blog:")
+    background_tasks.add_task(refresh_blog_snapshot, [post_id])
     
-    updated_post = await db.blog_posts.find_one({"id": post_id})
     return BlogPost(**updated_post)
 
 @api_router.delete("/blog/{post_id}")
-async def delete_blog_post(post_id: str):
+async def delete_blog_post(post_id: str, background_tasks: BackgroundTasks):
     """Delete a blog post"""
     result = await db.blog_posts.delete_one({"id": post_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Blog post not found")
+    await invalidation_bus.publish("blog:")
+    background_tasks.add_task(refresh_blog_snapshot, [post_id])
     return {"message": "Blog post deleted successfully"}
 
 # Analytics Endpoints
@@ -408,7 +1825,7 @@ async def track_analytics_event(event_data: AnalyticsEventCreate):
         event_dict = event_data.dict()
         event_obj = AnalyticsEvent(**event_dict)
         
-        await db.analytics.insert_one(event_obj.dict())
+        await record_analytics_event(event_obj)
         return event_obj
     except Exception as e:
         logger.error(f"Analytics tracking failed: {str(e)}")
@@ -418,51 +1835,81 @@ async def track_analytics_event(event_data: AnalyticsEventCreate):
 async def get_analytics_stats():
     """Get analytics statistics"""
     try:
-        # Total page views
-        total_views = await db.analytics.count_documents({"event_type": "page_view"})
-        
-        # Planet clicks
-        planet_clicks = await db.analytics.count_documents({"event_type": "planet_click"})
-        
-        # Resume downloads
-        resume_downloads = await db.analytics.count_documents({"event_type": "resume_download"})
+        async def load_stats():
+            await check_legacy_analytics()
+            
+            # Weighted totals per event type (estimates when sampling is enabled)
+            totals_pipeline = [
+                {"$match": analytics_type_match("page_view", "planet_click", "resume_download", "project_view")},
+                {"$group": {"_id": analytics_field("event_type"), "count": {"$sum": ANALYTICS_WEIGHT}}}
+            ]
+            totals = Counter()
+            for row in await db.analytics.aggregate(totals_pipeline).to_list(None):
+                totals[analytics_event_name(row["_id"])] += round(row["count"])
         
-        # Project views
-        project_views = await db.analytics.count_documents({"event_type": "project_view"})
+            # Most popular planets
+            planet_pipeline = [
+                {"$match": analytics_type_match("planet_click")},
+                {"$group": {"_id": analytics_field("planet"), "count": {"$sum": ANALYTICS_WEIGHT}}},
+                {"$sort": {"count": -1}},
+                {"$limit": 10}
+            ]
+            popular_planets = await db.analytics.aggregate(planet_pipeline).to_list(10)
+            for planet in popular_planets:
+                planet["count"] = round(planet["count"])
         
-        # Most popular planets
-        planet_pipeline = [
-            {"$match": {"event_type": "planet_click"}},
-            {"$group": {"_id": "$planet", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-            {"$limit": 10}
-        ]
-        popular_planets = await db.analytics.aggregate(planet_pipeline).to_list(10)
+            # Daily page views (last 30 days)
+            daily_pipeline = [
+                {"$match": analytics_type_match("page_view")},
+                {"$group": {
+                    "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": analytics_field("timestamp")}},
+                    "count": {"$sum": ANALYTICS_WEIGHT}
+                }},
+                {"$sort": {"_id": -1}},
+                {"$limit": 30}
+            ]
+            daily_views = await db.analytics.aggregate(daily_pipeline).to_list(30)
+            for day in daily_views:
+                day["count"] = round(day["count"])
         
-        # Daily page views (last 30 days)
-        daily_pipeline = [
-            {"$match": {"event_type": "page_view"}},
-            {"$group": {
-                "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}},
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"_id": -1}},
-            {"$limit": 30}
-        ]
-        daily_views = await db.analytics.aggregate(daily_pipeline).to_list(30)
+            return {
+                "total_views": totals.get("page_view", 0),
+                "planet_clicks": totals.get("planet_click", 0),
+                "resume_downloads": totals.get("resume_download", 0),
+                "project_views": totals.get("project_view", 0),
+                "popular_planets": popular_planets,
+                "daily_views": daily_views
+            }
         
-        return {
-            "total_views": total_views,
-            "planet_clicks": planet_clicks,
-            "resume_downloads": resume_downloads,
-            "project_views": project_views,
-            "popular_planets": popular_planets,
-            "daily_views": daily_views
-        }
+        return await response_cache.get_or_load("analytics:stats", load_stats)
     except Exception as e:
         logger.error(f"Analytics stats failed: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get analytics stats")
 
+@api_router.get("/analytics/live")
+async def stream_live_analytics(request: Request):
+    """Stream per-second analytics deltas as Server-Sent Events"""
+    queue = live_analytics.subscribe()
+
+    async def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    delta = await asyncio.wait_for(queue.get(), timeout=LIVE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {delta['seq']}\nevent: analytics\ndata: {json.dumps(delta)}\n\n"
+        finally:
+            live_analytics.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Project Filtering Endpoint
 @api_router.post("/projects/filter")
 async def filter_projects(filter_data: ProjectFilter):
@@ -476,7 +1923,7 @@ async def filter_projects(filter_data: ProjectFilter):
             event_type="project_filter",
             page="projects"
         )
-        await db.analytics.insert_one(analytics_event.dict())
+        await record_analytics_event(analytics_event)
         
         return {
             "message": "Project filtering endpoint ready",
@@ -486,28 +1933,35 @@ async def filter_projects(filter_data: ProjectFilter):
         logger.error(f"Project filtering failed: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to filter projects")
 
-# Blog Categories Endpoint
-@api_router.get("/blog/categories")
-async def get_blog_categories():
-    """Get all blog categories"""
-    categories = await db.blog_posts.distinct("category")
-    return {"categories": categories}
+# Admin Profiling Endpoints
+@api_router.get("/admin/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """List captured request profiles, newest first"""
+    if not PROFILE_DIR.exists():
+        return {"profiles": []}
+    profiles = sorted(stat_profiles(), key=lambda item: item[1].st_mtime, reverse=True)
+    return {"profiles": [
+        {
+            "name": profile.name,
+            "size": stat.st_size,
+            "created_at": datetime.utcfromtimestamp(stat.st_mtime)
+        }
+        for profile, stat in profiles
+    ]}
 
-# Blog Tags Endpoint
-@api_router.get("/blog/tags")
-async def get_blog_tags():
-    """Get all blog tags"""
-    pipeline = [
-        {"$unwind": "$tags"},
-        {"$group": {"_id": "$tags", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}}
-    ]
-    tags = await db.blog_posts.aggregate(pipeline).to_list(100)
-    return {"tags": [{"tag": tag["_id"], "count": tag["count"]} for tag in tags]}
+@api_router.get("/admin/profiles/{name}", dependencies=[Depends(require_admin)])
+async def download_profile(name: str):
+    """Download a captured request profile"""
+    profile_path = PROFILE_DIR / name
+    if not PROFILE_NAME_PATTERN.match(name) or not profile_path.is_file():
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(profile_path, media_type="text/plain", filename=name)
 
 # Include the router in the main app
 app.include_router(api_router)
 
+app.add_middleware(AdmissionControlMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -516,6 +1970,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(ProfilingMiddleware)
+
+@app.on_event("startup")
+async def start_background_tasks():
+    live_analytics.start()
+    invalidation_bus.start()
+    heartbeat_monitor.start()
+    app.state.analytics_storage_task = asyncio.create_task(prepare_analytics_storage())
+    app.state.blog_storage_task = asyncio.create_task(prepare_blog_storage())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await live_analytics.stop()
+    await invalidation_bus.stop()
+    await heartbeat_monitor.stop()
     client.close()
\ No newline at end of file
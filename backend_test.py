@@ -292,6 +292,145 @@ class BackendTester:
             self.log_test("MongoDB Connection", False, f"Database operation failed: {str(e)}")
             return False
     
+    def test_blog_bulk_import(self) -> bool:
+        """Test POST /api/blog/bulk NDJSON import with a per-line error"""
+        try:
+            unique_title = f"Bulk Import Test {int(time.time())}"
+            lines = [
+                json.dumps({"title": unique_title, "content": "Body", "excerpt": "Excerpt", "category": "testing"}),
+                json.dumps({"title": "Unsafe id", "content": "c", "excerpt": "e", "category": "testing", "id": "../../escape"}),
+            ]
+            body = "\n".join(lines) + "\n"
+            
+            response = self.session.post(
+                f"{API_BASE}/blog/bulk",
+                data=body,
+                headers={"Content-Type": "application/x-ndjson"},
+                timeout=10
+            )
+            if response.status_code != 200:
+                self.log_test("Blog Bulk Import", False, f"HTTP {response.status_code}", {"response": response.text})
+                return False
+            
+            report = response.json()
+            error_lines = [error["line"] for error in report.get("errors", [])]
+            if report.get("received") != 2 or report.get("upserted") != 1 or error_lines != [2]:
+                self.log_test("Blog Bulk Import", False, "Unexpected import report", report)
+                return False
+            
+            # Re-importing the same title must update the existing post, not duplicate it
+            response = self.session.post(
+                f"{API_BASE}/blog/bulk",
+                data=lines[0] + "\n",
+                headers={"Content-Type": "application/x-ndjson"},
+                timeout=10
+            )
+            report = response.json()
+            if report.get("upserted") != 0 or report.get("updated") != 1:
+                self.log_test("Blog Bulk Import", False, "Re-import created a duplicate", report)
+                return False
+            
+            self.log_test("Blog Bulk Import", True, "Bulk import upserted by slug and reported the invalid line")
+            return True
+        except requests.exceptions.RequestException as e:
+            self.log_test("Blog Bulk Import", False, f"Request failed: {str(e)}")
+            return False
+    
+    def test_status_summary(self) -> bool:
+        """Test GET /api/status/summary after posting a heartbeat"""
+        try:
+            client_name = f"Summary Test {int(time.time())}"
+            self.session.post(f"{API_BASE}/status", json={"client_name": client_name}, timeout=10)
+            
+            response = self.session.get(f"{API_BASE}/status/summary", timeout=10)
+            if response.status_code != 200:
+                self.log_test("Status Summary", False, f"HTTP {response.status_code}", {"response": response.text})
+                return False
+            
+            summaries = {item["client_name"]: item for item in response.json()}
+            summary = summaries.get(client_name)
+            required_fields = ["last_seen", "count", "seconds_since_last_seen", "gap_detected"]
+            if summary is None or any(field not in summary for field in required_fields):
+                self.log_test("Status Summary", False, "Heartbeat missing from summary", {"summary": summary})
+                return False
+            
+            self.log_test("Status Summary", True, f"Summary lists {len(summaries)} clients", summary)
+            return True
+        except requests.exceptions.RequestException as e:
+            self.log_test("Status Summary", False, f"Request failed: {str(e)}")
+            return False
+    
+    def test_analytics_live_stream(self) -> bool:
+        """Test GET /api/analytics/live delivers a delta for a tracked event"""
+        try:
+            with self.session.get(f"{API_BASE}/analytics/live", stream=True, timeout=10) as response:
+                if response.status_code != 200 or not response.headers.get("content-type", "").startswith("text/event-stream"):
+                    self.log_test("Analytics Live Stream", False, f"HTTP {response.status_code}", dict(response.headers))
+                    return False
+                
+                self.session.post(
+                    f"{API_BASE}/analytics/event",
+                    json={"event_type": "planet_click", "planet": "Mars"},
+                    timeout=10
+                )
+                
+                deadline = time.time() + 10
+                for line in response.iter_lines(decode_unicode=True):
+                    if line and line.startswith("data: "):
+                        delta = json.loads(line[len("data: "):])
+                        if delta.get("events", {}).get("planet_click"):
+                            self.log_test("Analytics Live Stream", True, "Received live delta", delta)
+                            return True
+                    if time.time() > deadline:
+                        break
+            
+            self.log_test("Analytics Live Stream", False, "No delta received within 10 seconds")
+            return False
+        except requests.exceptions.RequestException as e:
+            self.log_test("Analytics Live Stream", False, f"Request failed: {str(e)}")
+            return False
+    
+    def test_resume_range_download(self) -> bool:
+        """Test GET /api/resume/download full, ranged and If-Range responses"""
+        try:
+            full = self.session.get(f"{API_BASE}/resume/download", timeout=30)
+            etag = full.headers.get("etag", "")
+            if full.status_code != 200 or full.headers.get("accept-ranges") != "bytes" or not etag.startswith('"'):
+                self.log_test("Resume Range Download", False, f"HTTP {full.status_code}", dict(full.headers))
+                return False
+            
+            partial = self.session.get(
+                f"{API_BASE}/resume/download",
+                headers={"Range": "bytes=100-199", "If-Range": etag},
+                timeout=30
+            )
+            size = len(full.content)
+            if (partial.status_code != 206 or
+                    partial.headers.get("content-range") != f"bytes 100-199/{size}" or
+                    partial.content != full.content[100:200]):
+                self.log_test("Resume Range Download", False, f"Bad partial response: HTTP {partial.status_code}", dict(partial.headers))
+                return False
+            
+            unsatisfiable = self.session.get(f"{API_BASE}/resume/download", headers={"Range": f"bytes={size}-"}, timeout=30)
+            if unsatisfiable.status_code != 416:
+                self.log_test("Resume Range Download", False, f"Expected 416, got HTTP {unsatisfiable.status_code}")
+                return False
+            
+            stale = self.session.get(
+                f"{API_BASE}/resume/download",
+                headers={"Range": "bytes=100-199", "If-Range": '"stale"'},
+                timeout=30
+            )
+            if stale.status_code != 200 or stale.content != full.content:
+                self.log_test("Resume Range Download", False, f"Stale If-Range should send the full body, got HTTP {stale.status_code}")
+                return False
+            
+            self.log_test("Resume Range Download", True, f"Full ({size} bytes), partial, stale If-Range and 416 responses correct")
+            return True
+        except requests.exceptions.RequestException as e:
+            self.log_test("Resume Range Download", False, f"Request failed: {str(e)}")
+            return False
+    
     def run_all_tests(self) -> Dict[str, Any]:
         """Run all backend tests"""
         print("🚀 Starting Backend API Tests for 3D Solar System Portfolio")
@@ -309,7 +448,11 @@ class BackendTester:
             self.test_get_status_checks,
             self.test_data_persistence,
             self.test_mongodb_connection,
-            self.test_error_handling
+            self.test_error_handling,
+            self.test_blog_bulk_import,
+            self.test_status_summary,
+            self.test_analytics_live_stream,
+            self.test_resume_range_download
         ]
         
         for test in tests:
@@ -0,0 +1,110 @@
+import asyncio
+
+from server import ADMISSION_RETRY_AFTER_SECONDS, AdmissionControlMiddleware, PriorityLimiter, classify_request
+
+
+def test_classify_request():
+    assert classify_request("GET", "/api/resume/download") == "expensive"
+    assert classify_request("GET", "/api/analytics/stats") == "expensive"
+    assert classify_request("GET", "/api/blog/tags") == "cheap"
+    assert classify_request("POST", "/api/analytics/event") == "cheap"
+    assert classify_request("POST", "/api/blog") is None
+    assert classify_request("GET", "/api/analytics/live") is None
+
+
+def test_waiting_reads_are_served_before_writes():
+    async def scenario():
+        limiter = PriorityLimiter(limit=1, max_waiting=4, timeout_seconds=1.0)
+        order = []
+
+        async def job(name, priority):
+            assert await limiter.acquire(priority)
+            order.append(name)
+            await asyncio.sleep(0.01)
+            limiter.release()
+
+        await limiter.acquire(0)
+        jobs = [asyncio.create_task(job("write", 1)), asyncio.create_task(job("read", 0))]
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*jobs)
+        return order, limiter._active
+
+    order, active = asyncio.run(scenario())
+    assert order == ["read", "write"]
+    assert active == 0
+
+
+def test_full_queue_is_shed_immediately():
+    async def scenario():
+        limiter = PriorityLimiter(limit=1, max_waiting=0, timeout_seconds=1.0)
+        assert await limiter.acquire(0)
+        return await limiter.acquire(0)
+
+    assert asyncio.run(scenario()) is False
+
+
+def test_timed_out_waiter_leaves_the_queue():
+    async def scenario():
+        limiter = PriorityLimiter(limit=1, max_waiting=1, timeout_seconds=0.01)
+        await limiter.acquire(0)
+        admitted = await limiter.acquire(0)
+        limiter.release()
+        return admitted, limiter._waiters, limiter._active
+
+    admitted, waiters, active = asyncio.run(scenario())
+    assert admitted is False
+    assert waiters == []
+    assert active == 0
+
+
+def test_release_hands_the_slot_to_the_next_waiter():
+    async def scenario():
+        limiter = PriorityLimiter(limit=1, max_waiting=1, timeout_seconds=1.0)
+        await limiter.acquire(0)
+        waiter = asyncio.create_task(limiter.acquire(1))
+        await asyncio.sleep(0)
+        limiter.release()
+        admitted = await waiter
+        return admitted, limiter._active
+
+    assert asyncio.run(scenario()) == (True, 1)
+
+
+async def call_middleware(middleware, method, path):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": [], "query_string": b""}
+    await middleware(scope, receive, send)
+    return messages
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def test_middleware_sheds_with_503_and_retry_after():
+    limiter = PriorityLimiter(limit=0, max_waiting=0, timeout_seconds=1.0)
+    middleware = AdmissionControlMiddleware(ok_app, {"expensive": limiter, "cheap": limiter})
+    start, body = asyncio.run(call_middleware(middleware, "GET", "/api/resume/download"))
+
+    assert start["status"] == 503
+    assert (b"retry-after", str(ADMISSION_RETRY_AFTER_SECONDS).encode()) in start["headers"]
+    assert b"busy" in body["body"]
+
+
+def test_middleware_releases_the_slot_and_skips_unclassified_routes():
+    limiter = PriorityLimiter(limit=1, max_waiting=0, timeout_seconds=1.0)
+    middleware = AdmissionControlMiddleware(ok_app, {"expensive": limiter, "cheap": limiter})
+
+    assert asyncio.run(call_middleware(middleware, "GET", "/api/blog"))[0]["status"] == 200
+    assert limiter._active == 0
+    limiter._active = 1
+    assert asyncio.run(call_middleware(middleware, "GET", "/api/analytics/live"))[0]["status"] == 200
@@ -0,0 +1,31 @@
+from bson.binary import Binary
+
+from server import AnalyticsEvent, analytics_from_document, analytics_to_document
+
+
+def test_compact_document_round_trip():
+    event = AnalyticsEvent(event_type="planet_click", planet="Mars", sample_weight=10)
+    doc = analytics_to_document(event)
+
+    assert isinstance(doc["_id"], Binary)
+    assert doc["t"] == 2
+    assert doc["pl"] == "Mars"
+    assert doc["w"] == 10
+    assert "p" not in doc
+    assert analytics_from_document(doc) == event
+
+
+def test_unit_weight_and_unknown_event_type():
+    event = AnalyticsEvent(event_type="custom_event")
+    doc = analytics_to_document(event)
+
+    assert doc["t"] == "custom_event"
+    assert "w" not in doc
+    assert analytics_from_document(doc) == event
+
+
+def test_legacy_document_is_read_unchanged():
+    event = AnalyticsEvent(event_type="page_view", page="home")
+    legacy = {"_id": "legacy-object-id", **event.model_dump()}
+
+    assert analytics_from_document(legacy) == event
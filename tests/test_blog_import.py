@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from server import BlogPostImport, blog_import_operation, blog_post_slug, iter_ndjson_lines
+
+POST = {"title": "Hello, World!", "content": "c", "excerpt": "e", "category": "space"}
+
+
+async def collect(chunks):
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+    return [item async for item in iter_ndjson_lines(stream())]
+
+
+def test_ndjson_lines_span_chunks_and_skip_blanks():
+    lines = asyncio.run(collect([b'{"a":', b' 1}\n\n{"b": 2}\n', b'{"c": 3}']))
+    assert lines == [(1, b'{"a": 1}'), (3, b'{"b": 2}'), (4, b'{"c": 3}')]
+
+
+def test_import_without_id_upserts_on_slug():
+    operation = blog_import_operation(BlogPostImport(**POST))
+    update = operation._doc
+
+    assert operation._filter == {"slug": "hello-world"}
+    assert "id" in update["$setOnInsert"]
+    assert update["$setOnInsert"]["author"] == "Alex Cosmos"
+    assert update["$set"]["title"] == "Hello, World!"
+
+
+def test_import_with_id_upserts_on_id():
+    item = BlogPostImport(**POST, id="3f1c2b7e-0000-4000-8000-000000000000", author="Guest")
+    operation = blog_import_operation(item)
+
+    assert operation._filter == {"id": item.id}
+    assert operation._doc["$set"]["author"] == "Guest"
+    assert operation._doc["$setOnInsert"]["slug"] == "hello-world"
+
+
+@pytest.mark.parametrize("post_id", ["../../escape", "a/b", ""])
+def test_unsafe_ids_are_rejected(post_id):
+    with pytest.raises(ValidationError):
+        BlogPostImport(**POST, id=post_id)
+
+
+def test_slug_falls_back_for_titles_without_letters():
+    assert blog_post_slug("!!!").startswith("post-")
@@ -0,0 +1,195 @@
+import asyncio
+import fcntl
+import gzip
+import json
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import server
+from server import BlogPost, BlogSnapshot
+
+
+class FakeCursor:
+    def __init__(self, posts):
+        self.posts = posts
+
+    def sort(self, key, direction):
+        return FakeCursor(sorted(self.posts, key=lambda post: post[key], reverse=direction < 0))
+
+    def limit(self, count):
+        return FakeCursor(self.posts[:count])
+
+    async def to_list(self, length):
+        return self.posts[:length]
+
+    def __aiter__(self):
+        async def iterate():
+            for post in self.posts:
+                yield post
+        return iterate()
+
+
+class FakeBlogPosts:
+    def __init__(self):
+        self.posts = {}
+
+    def _matching(self, query):
+        return [post for post in self.posts.values() if all(post.get(k) == v for k, v in query.items())]
+
+    def find(self, query):
+        return FakeCursor(self._matching(query))
+
+    async def find_one(self, query):
+        matches = self._matching(query)
+        return matches[0] if matches else None
+
+    async def distinct(self, field, query):
+        return sorted({post[field] for post in self._matching(query)})
+
+    def aggregate(self, pipeline):
+        tags = {}
+        for post in self._matching(pipeline[0]["$match"]):
+            for tag in post["tags"]:
+                tags[tag] = tags.get(tag, 0) + 1
+        return FakeCursor([{"_id": tag, "count": count} for tag, count in tags.items()])
+
+
+@pytest.fixture
+def blog(monkeypatch):
+    posts = FakeBlogPosts()
+    monkeypatch.setattr(server, "db", SimpleNamespace(blog_posts=posts))
+    return posts
+
+
+def publish(blog, post_id, title, category="space", **fields):
+    blog.posts[post_id] = BlogPost(
+        id=post_id, title=title, content="c", excerpt="e", category=category, tags=["orbit"], **fields
+    ).dict()
+
+
+def manifest(root):
+    return json.loads((root / "manifest.json").read_text())
+
+
+def test_rebuild_writes_hashed_files_and_gzip_siblings(blog, tmp_path):
+    publish(blog, "p1", "First")
+    assert asyncio.run(BlogSnapshot(tmp_path).rebuild_all()) == 1
+
+    files = manifest(tmp_path)["files"]
+    assert set(files) == {"posts/p1", "categories/space", "index", "categories", "tags"}
+    post_path = tmp_path / files["posts/p1"]["path"]
+    assert json.loads(post_path.read_bytes())["title"] == "First"
+    assert gzip.decompress(post_path.with_name(post_path.name + ".gz").read_bytes()) == post_path.read_bytes()
+
+
+def test_incremental_rebuild_only_replaces_affected_files(blog, tmp_path):
+    publish(blog, "p1", "First")
+    publish(blog, "p2", "Second", category="stars")
+    snapshot = BlogSnapshot(tmp_path)
+    asyncio.run(snapshot.rebuild_all())
+    before = manifest(tmp_path)["files"]
+
+    publish(blog, "p1", "First, revised")
+    asyncio.run(snapshot.rebuild_posts(["p1"]))
+    after = manifest(tmp_path)
+
+    assert after["files"]["posts/p2"] == before["posts/p2"]
+    assert after["files"]["categories/stars"] == before["categories/stars"]
+    assert after["files"]["posts/p1"]["path"] != before["posts/p1"]["path"]
+    assert after["files"]["categories/space"]["path"] != before["categories/space"]["path"]
+
+
+def test_superseded_versions_stay_servable_until_retention_ends(blog, tmp_path):
+    publish(blog, "p1", "First")
+    snapshot = BlogSnapshot(tmp_path, retain_seconds=3600)
+    asyncio.run(snapshot.rebuild_all())
+    old_path = tmp_path / manifest(tmp_path)["files"]["posts/p1"]["path"]
+
+    publish(blog, "p1", "First, revised")
+    asyncio.run(snapshot.rebuild_posts(["p1"]))
+    assert old_path.exists()
+    assert {"name": "posts/p1", "path": str(old_path.relative_to(tmp_path))} in [
+        {"name": item["name"], "path": item["path"]} for item in manifest(tmp_path)["retired"]
+    ]
+
+    snapshot.retain_seconds = 0
+    publish(blog, "p2", "Second")
+    asyncio.run(snapshot.rebuild_posts(["p2"]))
+    assert not old_path.exists()
+
+
+def test_unpublished_post_is_removed_with_its_old_versions(blog, tmp_path):
+    publish(blog, "p1", "First")
+    snapshot = BlogSnapshot(tmp_path)
+    asyncio.run(snapshot.rebuild_all())
+    first_path = tmp_path / manifest(tmp_path)["files"]["posts/p1"]["path"]
+    publish(blog, "p1", "First, revised")
+    asyncio.run(snapshot.rebuild_posts(["p1"]))
+    second_path = tmp_path / manifest(tmp_path)["files"]["posts/p1"]["path"]
+
+    del blog.posts["p1"]
+    asyncio.run(snapshot.rebuild_posts(["p1"]))
+    saved = manifest(tmp_path)
+
+    assert "posts/p1" not in saved["files"]
+    assert "categories/space" not in saved["files"]
+    assert not any(item["name"] == "posts/p1" for item in saved["retired"])
+    assert not first_path.exists() and not second_path.exists()
+
+
+def test_full_rebuild_collects_orphans_past_retention(blog, tmp_path):
+    publish(blog, "p1", "First")
+    snapshot = BlogSnapshot(tmp_path, retain_seconds=60)
+    orphan = tmp_path / "posts" / "lost.0000.json"
+    orphan.parent.mkdir(parents=True)
+    orphan.write_text("{}")
+    recent = tmp_path / "posts" / "recent.0000.json"
+    recent.write_text("{}")
+    stale_time = time.time() - 120
+    os.utime(orphan, (stale_time, stale_time))
+
+    asyncio.run(snapshot.rebuild_all())
+
+    assert not orphan.exists()
+    assert recent.exists()
+
+
+def test_post_ids_never_become_paths(blog, tmp_path):
+    root = tmp_path / "snapshot"
+    publish(blog, "../../escape", "Escape")
+    asyncio.run(BlogSnapshot(root).rebuild_all())
+
+    post_path = (root / manifest(root)["files"]["posts/../../escape"]["path"]).resolve()
+    assert post_path.is_relative_to(root.resolve())
+    assert list(tmp_path.iterdir()) == [root]
+
+
+def test_manifest_paths_outside_the_root_are_refused(blog, tmp_path):
+    root = tmp_path / "snapshot"
+    root.mkdir()
+    victim = tmp_path / "victim.json"
+    victim.write_text("keep")
+    (root / "manifest.json").write_text(json.dumps({"files": {
+        "posts/p1": {"path": "../victim.json", "sha256": "x", "size": 4, "category": "space"}
+    }}))
+
+    with pytest.raises(ValueError):
+        asyncio.run(BlogSnapshot(root).rebuild_posts(["p1"]))
+    assert victim.read_text() == "keep"
+
+
+def test_manifest_update_holds_a_cross_process_lock(blog, tmp_path):
+    snapshot = BlogSnapshot(tmp_path)
+
+    async def scenario():
+        async with snapshot._exclusive():
+            with open(tmp_path / ".lock", "a") as other:
+                with pytest.raises(BlockingIOError):
+                    fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        with open(tmp_path / ".lock", "a") as other:
+            fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    asyncio.run(scenario())
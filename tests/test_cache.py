@@ -0,0 +1,138 @@
+import asyncio
+from datetime import datetime
+
+from server import WORKER_ID, InvalidationBus, ResponseCache
+
+
+def load(value):
+    async def loader():
+        return value
+    return loader
+
+
+def test_hits_are_served_from_cache():
+    async def scenario():
+        cache = ResponseCache(ttl_seconds=60)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return "value"
+
+        return await cache.get_or_load("blog:post:1", loader), await cache.get_or_load("blog:post:1", loader), calls
+
+    first, second, calls = asyncio.run(scenario())
+    assert first == second == "value"
+    assert len(calls) == 1
+
+
+def test_expired_entries_are_reloaded():
+    async def scenario():
+        cache = ResponseCache(ttl_seconds=0)
+        await cache.get_or_load("k", load("old"))
+        return await cache.get_or_load("k", load("new"))
+
+    assert asyncio.run(scenario()) == "new"
+
+
+def test_misses_are_not_cached():
+    async def scenario():
+        cache = ResponseCache()
+        await cache.get_or_load("blog:post:unknown", load(None))
+        return cache._entries
+
+    assert not asyncio.run(scenario())
+
+
+def test_least_recently_used_entry_is_evicted():
+    async def scenario():
+        cache = ResponseCache(max_entries=2)
+        await cache.get_or_load("a", load(1))
+        await cache.get_or_load("b", load(2))
+        await cache.get_or_load("a", load(None))
+        await cache.get_or_load("c", load(3))
+        return list(cache._entries)
+
+    assert asyncio.run(scenario()) == ["a", "c"]
+
+
+def test_evict_matches_prefixes():
+    async def scenario():
+        cache = ResponseCache()
+        for key in ("blog:post:1", "blog:tags", "analytics:stats"):
+            await cache.get_or_load(key, load(key))
+        return cache.evict("blog:"), list(cache._entries)
+
+    assert asyncio.run(scenario()) == (2, ["analytics:stats"])
+
+
+def test_load_racing_an_eviction_is_not_stored():
+    async def scenario():
+        cache = ResponseCache()
+        loading = asyncio.Event()
+        resume = asyncio.Event()
+
+        async def slow_loader():
+            loading.set()
+            await resume.wait()
+            return "old"
+
+        pending = asyncio.create_task(cache.get_or_load("blog:post:1", slow_loader))
+        await loading.wait()
+        cache.evict("blog:")
+        resume.set()
+        raced = await pending
+        return raced, await cache.get_or_load("blog:post:1", load("new"))
+
+    assert asyncio.run(scenario()) == ("old", "new")
+
+
+class RecordingFeed:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.messages = []
+
+    async def publish(self, message):
+        if self.fail:
+            raise ConnectionError("mongo down")
+        self.messages.append(message)
+
+
+def cached(*keys):
+    cache = ResponseCache()
+    for key in keys:
+        cache._entries[key] = (float("inf"), key)
+    return cache
+
+
+def test_publish_evicts_locally_and_broadcasts():
+    bus = InvalidationBus(cached("blog:post:1", "analytics:stats"))
+    bus.feed = RecordingFeed()
+    asyncio.run(bus.publish("blog:"))
+
+    assert list(bus.cache._entries) == ["analytics:stats"]
+    assert bus.feed.messages == [{"prefixes": ["blog:"]}]
+
+
+def test_publish_failure_still_evicts_locally():
+    bus = InvalidationBus(cached("blog:post:1"))
+    bus.feed = RecordingFeed(fail=True)
+    asyncio.run(bus.publish("blog:"))
+
+    assert not bus.cache._entries
+
+
+def test_notices_from_other_workers_are_applied():
+    bus = InvalidationBus(cached("blog:post:1", "analytics:stats"))
+    now = datetime.utcnow()
+    bus._apply({"origin": WORKER_ID, "prefixes": ["analytics:"]}, now)
+    bus._apply({"origin": "other-worker", "prefixes": ["blog:"]}, now)
+
+    assert list(bus.cache._entries) == ["analytics:stats"]
+
+
+def test_tail_restart_drops_the_whole_cache():
+    bus = InvalidationBus(cached("blog:post:1", "analytics:stats"))
+    bus.feed.on_restart()
+
+    assert not bus.cache._entries
@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta
+
+from server import HeartbeatMonitor, status_client_update
+
+START = datetime(2026, 1, 1)
+
+
+def shared_state(last_seen_seconds, count, interval=None, max_gap=None):
+    return {
+        "client_name": "probe",
+        "first_seen": START,
+        "last_seen": START + timedelta(seconds=last_seen_seconds),
+        "count": count,
+        "interval": interval,
+        "max_gap": max_gap,
+    }
+
+
+def test_record_only_advances_last_seen():
+    monitor = HeartbeatMonitor()
+    for seconds in (0, 30, 20):
+        monitor.record("probe", START + timedelta(seconds=seconds))
+
+    [summary] = monitor.summary(START + timedelta(seconds=30))
+    assert summary.count == 3
+    assert summary.last_seen == START + timedelta(seconds=30)
+    assert summary.expected_interval_seconds is None
+    assert summary.max_gap_seconds is None
+
+
+def test_summary_uses_interval_shared_by_round_robin_workers():
+    # Three workers each see every third beat of a 10s heartbeat
+    monitor = HeartbeatMonitor()
+    for seconds in (0, 30, 60, 90):
+        monitor.record("probe", START + timedelta(seconds=seconds))
+    monitor.merge(shared_state(100, 11, interval=10.0, max_gap=10.0))
+
+    [summary] = monitor.summary(START + timedelta(seconds=100))
+    assert summary.count == 11
+    assert summary.expected_interval_seconds == 10.0
+    assert summary.rate_per_minute == 6.0
+    assert summary.max_gap_seconds == 10.0
+    assert summary.last_seen == START + timedelta(seconds=100)
+
+
+def test_local_heartbeat_after_sync_keeps_shared_statistics():
+    monitor = HeartbeatMonitor()
+    monitor.merge(shared_state(100, 11, interval=10.0, max_gap=10.0))
+    monitor.record("probe", START + timedelta(seconds=110))
+
+    [summary] = monitor.summary(START + timedelta(seconds=110))
+    assert summary.count == 12
+    assert summary.expected_interval_seconds == 10.0
+    assert summary.last_seen == START + timedelta(seconds=110)
+
+
+def test_gap_threshold_follows_shared_interval():
+    monitor = HeartbeatMonitor()
+    monitor.merge(shared_state(0, 50, interval=30.0, max_gap=40.0))
+
+    [on_time] = monitor.summary(START + timedelta(seconds=80))
+    [late] = monitor.summary(START + timedelta(seconds=100))
+    assert on_time.gap_detected is False
+    assert late.gap_detected is True
+
+
+def test_older_document_does_not_overwrite_newer_state():
+    monitor = HeartbeatMonitor()
+    monitor.merge(shared_state(100, 11, interval=10.0, max_gap=12.0))
+    monitor.merge(shared_state(90, 10, interval=11.0, max_gap=11.0))
+
+    [summary] = monitor.summary(START + timedelta(seconds=100))
+    assert summary.count == 11
+    assert summary.expected_interval_seconds == 10.0
+    assert summary.max_gap_seconds == 12.0
+
+
+def test_documents_without_shared_interval_fall_back_to_the_mean():
+    monitor = HeartbeatMonitor()
+    monitor.merge({"client_name": "probe", "first_seen": START, "last_seen": START + timedelta(seconds=600), "count": 11})
+
+    [summary] = monitor.summary(START + timedelta(seconds=600))
+    assert summary.expected_interval_seconds == 60.0
+    assert summary.rate_per_minute == 1.0
+    assert not summary.gap_detected
+
+
+MISSING = object()
+
+
+def evaluate(expr, doc):
+    """Evaluate the aggregation operators status_client_update uses"""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return doc.get(expr[1:], MISSING)
+    if not isinstance(expr, dict):
+        return expr
+    [(op, args)] = expr.items()
+    values = [evaluate(arg, doc) for arg in args]
+    present = [v for v in values if v is not MISSING and v is not None]
+    if op == "$ifNull":
+        return present[0] if present else None
+    if op == "$cond":
+        return evaluate(args[1] if values[0] else args[2], doc)
+    if op in ("$max", "$min"):
+        return (max if op == "$max" else min)(present) if present else None
+    if len(present) < len(values):
+        # Arithmetic on null/missing yields null; comparisons order null below dates
+        return {"$eq": values[0] in (None, MISSING) and values[1] in (None, MISSING), "$gt": bool(present)}.get(op)
+    a, b = values
+    if op == "$subtract":
+        difference = a - b
+        return difference / timedelta(milliseconds=1) if isinstance(difference, timedelta) else difference
+    return {"$gt": lambda: a > b, "$eq": lambda: a == b, "$add": lambda: a + b,
+            "$multiply": lambda: a * b, "$divide": lambda: a / b}[op]()
+
+
+def apply_update(doc, timestamp):
+    for stage in status_client_update(timestamp):
+        if "$unset" in stage:
+            doc.pop(stage["$unset"], None)
+            continue
+        computed = {field: evaluate(expr, doc) for field, expr in stage["$set"].items()}
+        doc.update({field: value for field, value in computed.items() if value is not MISSING})
+    return doc
+
+
+def test_update_pipeline_shares_interval_across_workers():
+    doc = {"client_name": "probe"}
+    workers = [HeartbeatMonitor() for _ in range(3)]
+    for beat in range(12):
+        timestamp = START + timedelta(seconds=10 * beat)
+        worker = workers[beat % 3]
+        worker.record("probe", timestamp)
+        worker.merge(dict(apply_update(doc, timestamp)))
+
+    assert "_gap" not in doc
+    assert doc["count"] == 12
+    assert doc["interval"] == 10.0
+    assert doc["max_gap"] == 10.0
+    [summary] = workers[0].summary(START + timedelta(seconds=120))
+    assert summary.rate_per_minute == 6.0
+
+
+def test_update_pipeline_smooths_intervals_and_ignores_late_heartbeats():
+    doc = {"client_name": "probe"}
+    for seconds in (0, 10, 40, 35):
+        apply_update(doc, START + timedelta(seconds=seconds))
+
+    assert doc["count"] == 4
+    assert doc["last_seen"] == START + timedelta(seconds=40)
+    assert doc["interval"] == 14.0
+    assert doc["max_gap"] == 30.0
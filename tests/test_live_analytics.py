@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from server import LIVE_REPLAY_SECONDS, AnalyticsEvent, LiveAnalyticsHub
+
+
+def test_local_counts_are_taken_once():
+    hub = LiveAnalyticsHub()
+    hub.record(AnalyticsEvent(event_type="planet_click", planet="Mars"))
+    hub.record(AnalyticsEvent(event_type="page_view"))
+
+    local = hub._take_local()
+    assert dict(local["events"]) == {"planet_click": 1, "page_view": 1}
+    assert dict(local["planets"]) == {"Mars": 1}
+    assert hub._take_local() is None
+
+
+def test_flush_sums_deltas_from_every_worker():
+    hub = LiveAnalyticsHub()
+    opened_at = datetime.utcnow()
+    hub._merge_message({"events": [["planet_click", 2]], "planets": [["Mars", 2]], "timestamp": opened_at}, opened_at)
+    hub._merge_message({"events": [["planet_click", 1], ["page_view", 4]], "planets": [], "timestamp": opened_at}, opened_at)
+
+    delta = hub._flush()
+    assert delta["seq"] == 1
+    assert delta["events"] == {"planet_click": 3, "page_view": 4}
+    assert delta["planets"] == {"Mars": 2}
+    assert hub._flush() is None
+
+
+def test_history_older_than_replay_window_is_skipped():
+    hub = LiveAnalyticsHub()
+    opened_at = datetime.utcnow()
+    old = opened_at - timedelta(seconds=LIVE_REPLAY_SECONDS + 1)
+    hub._merge_message({"events": [["page_view", 9]], "planets": [], "timestamp": old}, opened_at)
+
+    assert hub._flush() is None
+
+
+def test_slow_consumer_drops_its_oldest_delta():
+    hub = LiveAnalyticsHub(queue_size=2)
+    slow = hub.subscribe()
+    for seq in (1, 2, 3):
+        hub._publish({"seq": seq})
+
+    assert [slow.get_nowait()["seq"] for _ in range(slow.qsize())] == [2, 3]
+
+
+def test_unreachable_feed_still_feeds_local_subscribers():
+    class FailingFeed:
+        async def publish(self, message):
+            raise ConnectionError("mongo down")
+
+    async def scenario():
+        hub = LiveAnalyticsHub(tick_seconds=0.01)
+        hub.feed = FailingFeed()
+        queue = hub.subscribe()
+        hub.record(AnalyticsEvent(event_type="page_view"))
+        task = asyncio.create_task(hub._run())
+        try:
+            return await asyncio.wait_for(queue.get(), timeout=1)
+        finally:
+            task.cancel()
+
+    delta = asyncio.run(scenario())
+    assert delta["events"] == {"page_view": 1}
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+import server
+from server import profile_requested, profile_signature
+
+
+@pytest.fixture(autouse=True)
+def admin_token(monkeypatch):
+    monkeypatch.setattr(server, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(server, "PROFILE_SAMPLE_RATE", 0)
+
+
+def scope(path="/api/analytics/stats", method="GET", signature=None):
+    headers = [(b"accept", b"*/*")]
+    if signature is not None:
+        headers.append((b"x-profile-signature", signature.encode("latin-1")))
+    return {"type": "http", "method": method, "path": path, "headers": headers}
+
+
+def test_valid_signature_triggers_profiling():
+    signature = profile_signature("GET", "/api/analytics/stats", int(time.time()) + 60)
+    assert profile_requested(scope(signature=signature))
+
+
+def test_unsigned_request_is_not_profiled():
+    assert not profile_requested(scope())
+
+
+def test_expired_signature_is_rejected():
+    signature = profile_signature("GET", "/api/analytics/stats", int(time.time()) - 1)
+    assert not profile_requested(scope(signature=signature))
+
+
+@pytest.mark.parametrize("request_scope", [
+    scope(path="/api/blog"),
+    scope(method="POST"),
+])
+def test_signature_is_bound_to_method_and_path(request_scope):
+    signature = profile_signature("GET", "/api/analytics/stats", int(time.time()) + 60)
+    request_scope["headers"].append((b"x-profile-signature", signature.encode()))
+    assert not profile_requested(request_scope)
+
+
+@pytest.mark.parametrize("signature", ["", "soon.abc", "9999999999.forged", "9999999999"])
+def test_malformed_or_forged_signature_is_rejected(signature):
+    assert not profile_requested(scope(signature=signature))
+
+
+def test_signature_is_ignored_without_admin_token(monkeypatch):
+    signature = profile_signature("GET", "/api/analytics/stats", int(time.time()) + 60)
+    monkeypatch.setattr(server, "ADMIN_TOKEN", None)
+    assert not profile_requested(scope(signature=signature))
+
+
+def test_sample_rate_profiles_without_a_signature(monkeypatch):
+    monkeypatch.setattr(server, "PROFILE_SAMPLE_RATE", 1.0)
+    assert profile_requested(scope())
+
+
+def test_live_stream_is_never_profiled(monkeypatch):
+    monkeypatch.setattr(server, "PROFILE_SAMPLE_RATE", 1.0)
+    signature = profile_signature("GET", "/api/analytics/live", int(time.time()) + 60)
+    assert not profile_requested(scope(path="/api/analytics/live", signature=signature))
@@ -0,0 +1,51 @@
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException
+
+from server import buffer_etag, if_range_matches, parse_byte_range
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("bytes=0-", (0, 99)),
+    ("bytes=10-19", (10, 19)),
+    ("bytes=90-500", (90, 99)),
+    ("bytes=-30", (70, 99)),
+    ("bytes=5-3", None),
+    ("bytes=0-1,5-6", None),
+    ("items=0-1", None),
+    ("bytes=x-1", None),
+])
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=150-200", "bytes=-0"])
+def test_unsatisfiable_range(header):
+    with pytest.raises(HTTPException) as excinfo:
+        parse_byte_range(header, 100)
+    assert excinfo.value.status_code == 416
+    assert excinfo.value.headers["Content-Range"] == "bytes */100"
+
+
+def test_etag_is_a_strong_content_hash():
+    buffer = io.BytesIO(b"%PDF-1.4 resume")
+    buffer.seek(0, io.SEEK_END)
+    etag = buffer_etag(buffer)
+
+    assert etag == f'"{hashlib.sha256(b"%PDF-1.4 resume").hexdigest()}"'
+    assert buffer.tell() == 0
+    assert buffer_etag(io.BytesIO(b"%PDF-1.4 other")) != etag
+
+
+@pytest.mark.parametrize("if_range, expected", [
+    (None, True),
+    ('"abc"', True),
+    ('"old"', False),
+    ('W/"abc"', False),
+    ("Mon, 19 Oct 2026 10:00:00 GMT", False),
+])
+def test_if_range_matches(if_range, expected):
+    assert if_range_matches(if_range, '"abc"') is expected
@@ -0,0 +1,56 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import server
+from server import AnalyticsEvent, LiveAnalyticsHub, load_sample_rates, record_analytics_event
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (None, {}),
+    ("", {}),
+    ('{"planet_click": 0.1, "page_view": "0.5"}', {"planet_click": 0.1, "page_view": 0.5}),
+    ('{"planet_click": 2, "page_view": -1}', {"planet_click": 1.0, "page_view": 0.0}),
+    ("not json", {}),
+    ("[0.1]", {}),
+    ('{"planet_click": "often"}', {}),
+])
+def test_load_sample_rates(raw, expected):
+    assert load_sample_rates(raw) == expected
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    documents = []
+
+    async def insert_one(doc):
+        documents.append(doc)
+
+    monkeypatch.setattr(server, "db", SimpleNamespace(analytics=SimpleNamespace(insert_one=insert_one)))
+    monkeypatch.setattr(server, "live_analytics", LiveAnalyticsHub())
+    monkeypatch.setattr(server, "ANALYTICS_SAMPLE_RATES", {"planet_click": 0.25, "page_view": 0.0})
+    return documents
+
+
+def test_kept_sample_records_inverse_rate(stored, monkeypatch):
+    monkeypatch.setattr(server.random, "random", lambda: 0.1)
+    asyncio.run(record_analytics_event(AnalyticsEvent(event_type="planet_click")))
+
+    assert [doc["w"] for doc in stored] == [4.0]
+
+
+def test_dropped_sample_still_reaches_live_stream(stored, monkeypatch):
+    monkeypatch.setattr(server.random, "random", lambda: 0.9)
+    asyncio.run(record_analytics_event(AnalyticsEvent(event_type="planet_click")))
+    asyncio.run(record_analytics_event(AnalyticsEvent(event_type="page_view")))
+
+    assert stored == []
+    assert dict(server.live_analytics._take_local()["events"]) == {"planet_click": 1, "page_view": 1}
+
+
+def test_unsampled_event_type_is_stored_unweighted(stored):
+    asyncio.run(record_analytics_event(AnalyticsEvent(event_type="resume_download")))
+
+    assert len(stored) == 1
+    assert "w" not in stored[0]